@@ -0,0 +1,78 @@
+"""
+Measures the import time of the library modules with ``python -X importtime``.
+
+Each module is imported in a fresh interpreter several times, and the median cumulative import time is reported,
+along with the slowest modules that were imported by it.
+
+=====
+Usage
+=====
+python benchmarks/startup.py
+python benchmarks/startup.py lms.message.msbtio lms.project.msbpread --runs 20
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+DEFAULT_MODULES = [
+    "lms.message.msbtio",
+    "lms.project.msbpread",
+    "lms.titleconfig.config",
+]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(module: str) -> dict[str, tuple[int, int]]:
+    """
+    Imports a module in a new interpreter and returns the self and cumulative time of every imported module in microseconds.
+
+    :param module: the name of the module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        check=True,
+    )
+
+    # Each line is formatted as "import time: self [us] | cumulative | imported package"
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_time, cumulative_time, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(self_time), int(cumulative_time))
+
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measures the import time of the library modules.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="the modules to import.")
+    parser.add_argument("--runs", type=int, default=10, help="the amount of imports of each module.")
+    parser.add_argument("--top", type=int, default=5, help="the amount of slowest modules to list.")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        runs = [measure_import(module) for _ in range(args.runs)]
+        cumulative = statistics.median(times[module][1] for times in runs)
+        print(f"{module}: {cumulative / 1000:.1f} ms (median of {args.runs})")
+
+        # The slowest modules by their own import time, taken from the last run
+        slowest = sorted(runs[-1].items(), key=lambda item: item[1][0], reverse=True)
+        for name, (self_time, _) in slowest[: args.top]:
+            print(f"    {name}: {self_time / 1000:.1f} ms")
+
+        for heavy_module in ("yaml", "lms.titleconfig.config"):
+            if heavy_module in runs[-1] and heavy_module != module:
+                print(f"    imports {heavy_module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -78,48 +78,33 @@ class LMS_DataType(Enum):
     @property
     def signed(self) -> bool:
         """Property for if the type is signed or not."""
-        if self not in [
-            LMS_DataType.STRING,
-            LMS_DataType.LIST,
-            LMS_DataType.BOOL,
-            LMS_DataType.BYTES,
-        ]:
-            return self in [LMS_DataType.INT8, LMS_DataType.INT16, LMS_DataType.INT32]
+        if self in _NUMBER_TYPES:
+            return self in _SIGNED_TYPES
 
         raise TypeError(f"Signed is not a valid property for '{self.to_string()}'!")
 
     @property
     def builtin_type(self) -> Type[int | float | str | bool | bytes]:
         """The enum as the builtin python type."""
-        return {
-            LMS_DataType.UINT8: int,
-            LMS_DataType.UINT16: int,
-            LMS_DataType.UINT32: int,
-            LMS_DataType.INT8: int,
-            LMS_DataType.INT16: int,
-            LMS_DataType.INT32: int,
-            LMS_DataType.FLOAT32: float,
-            LMS_DataType.STRING: str,
-            LMS_DataType.LIST: str,
-            LMS_DataType.BOOL: bool,
-            LMS_DataType.BYTES: bytes,
-        }[self]
+        return _BUILTIN_TYPES[self]
 
     @property
     def stream_size(self) -> int:
         """The size the datatype takes up in a stream."""
-        return {
-            LMS_DataType.UINT8: 1,
-            LMS_DataType.UINT16: 2,
-            LMS_DataType.UINT32: 4,
-            LMS_DataType.INT8: 1,
-            LMS_DataType.INT16: 2,
-            LMS_DataType.INT32: 4,
-            LMS_DataType.FLOAT32: 4,
-            LMS_DataType.LIST: 1,
-            LMS_DataType.BOOL: 1,
-            LMS_DataType.BYTES: 1,
-        }[self]
+        return _STREAM_SIZES[self]
+
+    @property
+    def struct_format(self) -> str:
+        """The format character of the datatype for the ``struct`` module."""
+        return _STRUCT_FORMATS[self]
+
+    @property
+    def integer_range(self) -> tuple[int, int]:
+        """The (min, max) range of integer values that are valid for the type."""
+        if self in _INTEGER_RANGES:
+            return _INTEGER_RANGES[self]
+
+        raise TypeError(f"Integer range is not a valid property for '{self.to_string()}'!")
 
     @classmethod
     def from_string(cls, string: str):
@@ -133,3 +118,69 @@ class LMS_DataType(Enum):
             return cls[alias_member]
         else:
             raise ValueError(f"Unknown value of '{string}' was provided!")
+
+
+# The metadata of each datatype is built once here, as the properties are accessed for every field value
+_NUMBER_TYPES = frozenset(
+    {
+        LMS_DataType.UINT8,
+        LMS_DataType.UINT16,
+        LMS_DataType.UINT32,
+        LMS_DataType.INT8,
+        LMS_DataType.INT16,
+        LMS_DataType.INT32,
+        LMS_DataType.FLOAT32,
+    }
+)
+
+_SIGNED_TYPES = frozenset({LMS_DataType.INT8, LMS_DataType.INT16, LMS_DataType.INT32})
+
+_BUILTIN_TYPES = {
+    LMS_DataType.UINT8: int,
+    LMS_DataType.UINT16: int,
+    LMS_DataType.UINT32: int,
+    LMS_DataType.INT8: int,
+    LMS_DataType.INT16: int,
+    LMS_DataType.INT32: int,
+    LMS_DataType.FLOAT32: float,
+    LMS_DataType.STRING: str,
+    LMS_DataType.LIST: str,
+    LMS_DataType.BOOL: bool,
+    LMS_DataType.BYTES: bytes,
+}
+
+_STREAM_SIZES = {
+    LMS_DataType.UINT8: 1,
+    LMS_DataType.UINT16: 2,
+    LMS_DataType.UINT32: 4,
+    LMS_DataType.INT8: 1,
+    LMS_DataType.INT16: 2,
+    LMS_DataType.INT32: 4,
+    LMS_DataType.FLOAT32: 4,
+    LMS_DataType.LIST: 1,
+    LMS_DataType.BOOL: 1,
+    LMS_DataType.BYTES: 1,
+}
+
+_STRUCT_FORMATS = {
+    LMS_DataType.UINT8: "B",
+    LMS_DataType.UINT16: "H",
+    LMS_DataType.UINT32: "I",
+    LMS_DataType.INT8: "b",
+    LMS_DataType.INT16: "h",
+    LMS_DataType.INT32: "i",
+    LMS_DataType.FLOAT32: "f",
+    LMS_DataType.LIST: "B",
+    LMS_DataType.BOOL: "B",
+    LMS_DataType.BYTES: "c",
+}
+
+
+def _get_integer_range(datatype: LMS_DataType) -> tuple[int, int]:
+    bits = _STREAM_SIZES[datatype] * 8
+    if datatype in _SIGNED_TYPES:
+        return -(2 ** (bits - 1)), 2 ** (bits - 1)
+    return 0, (2 ** bits) - 1
+
+
+_INTEGER_RANGES = {datatype: _get_integer_range(datatype) for datatype in _NUMBER_TYPES}
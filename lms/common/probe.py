@@ -0,0 +1,120 @@
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO, Callable
+
+from lms.common import lms_exceptions
+from lms.common.stream.fileinfo import BIG_ENDIAN_BOM, DATA_START, LITTLE_ENDIAN_BOM
+from lms.common.stream.section import SECTION_HEADER_SIZE, SectionInfo, walk_section_headers
+from lms.fileio.encoding import FileEncoding
+
+__all__ = ["LMS_ProbeInfo", "probe_lms"]
+
+ENCODING_OFFSET = 0x0C
+
+# The header from the encoding onward: encoding, version, section count and file size
+HEADER_STRUCTS = {False: struct.Struct("<BBH2xI"), True: struct.Struct(">BBH2xI")}
+SECTION_HEADER_STRUCTS = {False: struct.Struct("<4sI"), True: struct.Struct(">4sI")}
+
+
+@dataclass(frozen=True)
+class LMS_ProbeInfo:
+    """The header and section directory of a LMS file."""
+
+    magic: str
+    is_big_endian: bool
+    encoding: FileEncoding
+    version: int
+    file_size: int
+    sections: list[SectionInfo]
+
+    @property
+    def section_names(self) -> list[str]:
+        """The names of the sections, in the order of the file."""
+        return [section.magic for section in self.sections]
+
+
+def probe_lms(source: str | os.PathLike | BinaryIO | bytes | memoryview | mmap.mmap) -> LMS_ProbeInfo:
+    """
+    Reads only the header and the section headers of a LMS file of any format, without reading any section data.
+
+    :param source: a path to the file, a seekable binary stream that is read from its start, or a ``bytes``, ``memoryview``, or ``mmap`` object.
+
+    =====
+    Usage
+    =====
+    >>> info = probe_lms("path/to/file.msbt")
+    >>> print(info.magic, info.encoding, info.section_names)
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as stream:
+            return _probe(_get_stream_reader(stream))
+
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return _probe(_get_buffer_reader(source))
+
+    return _probe(_get_stream_reader(source))
+
+
+def _probe(read_at: Callable[[int, int], bytes]) -> LMS_ProbeInfo:
+    header = read_at(0, DATA_START)
+    if len(header) < DATA_START:
+        raise lms_exceptions.LMS_Error("The file is too small to be a LMS file!")
+
+    bom = header[8:10]
+    if bom not in (LITTLE_ENDIAN_BOM, BIG_ENDIAN_BOM):
+        raise lms_exceptions.LMS_UnexpectedMagicError("The file does not have a valid byte order mark for a LMS file!")
+
+    is_big_endian = bom == BIG_ENDIAN_BOM
+    encoding, version, section_count, file_size = HEADER_STRUCTS[is_big_endian].unpack_from(header, ENCODING_OFFSET)
+
+    try:
+        encoding = FileEncoding(encoding)
+    except ValueError:
+        raise lms_exceptions.LMS_Error(f"The encoding {encoding} is not valid for a LMS file!") from None
+
+    # Each section header is read on its own, as the section data in between is skipped
+    section_header = SECTION_HEADER_STRUCTS[is_big_endian]
+
+    def read_header(position: int) -> tuple[str, int]:
+        data = read_at(position, SECTION_HEADER_SIZE)
+        if len(data) < SECTION_HEADER_SIZE:
+            raise lms_exceptions.LMS_Error(f"The section header at offset {position} is past the end of the file!")
+
+        magic, size = section_header.unpack_from(data)
+        return _decode_magic(magic), size
+
+    return LMS_ProbeInfo(
+        _decode_magic(header[:8]),
+        is_big_endian,
+        encoding,
+        version,
+        file_size,
+        walk_section_headers(read_header, section_count),
+    )
+
+
+def _decode_magic(magic: bytes) -> str:
+    try:
+        return magic.decode("UTF-8")
+    except UnicodeDecodeError:
+        raise lms_exceptions.LMS_UnexpectedMagicError(f"The magic {magic!r} is not valid for a LMS file!") from None
+
+
+def _get_stream_reader(stream: BinaryIO) -> Callable[[int, int], bytes]:
+    # Offsets are from the start of the stream, regardless of how much of it was already read
+    def read_at(offset: int, length: int) -> bytes:
+        stream.seek(offset)
+        return stream.read(length)
+
+    return read_at
+
+
+def _get_buffer_reader(buffer: bytes | bytearray | memoryview | mmap.mmap) -> Callable[[int, int], bytes]:
+    view = memoryview(buffer)
+
+    def read_at(offset: int, length: int) -> bytes:
+        return bytes(view[offset:offset + length])
+
+    return read_at
@@ -1,16 +1,46 @@
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
 from lms.fileio.io import FileReader, FileWriter
 
+# The length of a label is stored as a single byte
+LENGTH_BYTES = [bytes([length]) for length in range(256)]
+
+# The amount of labels per slot that an optimized slot count is picked for
+DEFAULT_LOAD_FACTOR = 1.0
+
+# The amount of primes after the target slot count that are compared for the shortest chains
+SLOT_COUNT_CANDIDATES = 8
+
+
+@dataclass(frozen=True)
+class HashTableStats:
+    """Statistics of the slots of a label hash table."""
+
+    slot_count: int
+    label_count: int
+    used_slots: int
+    longest_chain: int
+
+    @property
+    def load_factor(self) -> float:
+        """The average amount of labels per slot."""
+        return self.label_count / self.slot_count
+
+    @property
+    def average_chain(self) -> float:
+        """The average amount of labels in each slot that is used."""
+        return self.label_count / self.used_slots if self.used_slots else 0.0
+
 
 def read_labels(reader: FileReader) -> tuple[dict, int]:
     labels = {}
 
     data_start = reader.tell()
     slot_count = reader.read_uint32()
-    for _ in range(slot_count):
-        label_count = reader.read_uint32()
-        offset = reader.read_uint32()
-        next_offset = reader.tell()
-
+    slots = reader.read_uint32_array(slot_count * 2)
+    for label_count, offset in zip(slots[::2], slots[1::2]):
         reader.seek(data_start + offset)
         for _ in range(label_count):
             length = reader.read_uint8()
@@ -18,8 +48,6 @@ def read_labels(reader: FileReader) -> tuple[dict, int]:
             item_index = reader.read_uint32()
             labels[item_index] = label
 
-        reader.seek(next_offset)
-
     sorted_labels = {i: labels[i] for i in sorted(labels)}
 
     # While the slot count is consistent for most files, some vary them.
@@ -27,48 +55,134 @@ def read_labels(reader: FileReader) -> tuple[dict, int]:
     return sorted_labels, slot_count
 
 
-def write_labels(writer: FileWriter, labels: list[str], slot_count: int) -> None:
-    writer.write_uint32(slot_count)
+def find_label_index(reader: FileReader, label: str) -> int | None:
+    """
+    Finds the item index of a label by only reading the hash slot of the label.
 
-    hash_slots = {}
-    index_map = {}
-    # Add each label to each hash slot
-    for i, label in enumerate(labels):
-        hash = _calculate_hash(label, slot_count)
+    :param reader: a reader positioned at the start of the hash table.
+    :param label: the label to find.
+    """
+    data_start = reader.tell()
+    slot_count = reader.read_uint32()
 
-        if hash not in hash_slots:
-            hash_slots[hash] = [label]
-        else:
-            hash_slots[hash].append(label)
+    reader.seek(data_start + 4 + _calculate_hash(label, slot_count) * 8)
+    label_count = reader.read_uint32()
+    reader.seek(data_start + reader.read_uint32())
 
-        index_map[label] = i
+    for _ in range(label_count):
+        length = reader.read_uint8()
+        stored_label = reader.read_string_len(length)
+        item_index = reader.read_uint32()
+        if stored_label == label:
+            return item_index
 
-    label_offsets = slot_count * 8 + 4
+    return None
+
+
+def write_labels(writer: FileWriter, labels: list[str], slot_count: int | None) -> None:
+    if slot_count is None:
+        slot_count = get_optimal_slot_count(labels)
+
+    byteorder = "little" if not writer.is_big_endian else "big"
 
-    hash_slots = dict(sorted(hash_slots.items(), key=lambda x: x[0]))
-
-    for i in range(slot_count):
-        if i in hash_slots:
-            writer.write_uint32(len(hash_slots[i]))
-            writer.write_uint32(label_offsets)
-            for label in hash_slots[i]:
-                label_offsets += len(label) + 5
-        else:
-            writer.write_uint32(0)
-            writer.write_uint32(label_offsets)
-
-    # Write the labels
-    for key in hash_slots:
-        stored_labels = hash_slots[key]
+    # Duplicate labels share the index of the last entry
+    index_map = {label: i for i, label in enumerate(labels)}
+
+    # Add each label to each hash slot
+    hash_slots: list[list[str]] = [[] for _ in range(slot_count)]
+    for label in labels:
+        hash_slots[_calculate_label_hash(label) % slot_count].append(label)
+
+    slots = []
+    label_data = bytearray()
+    label_offsets = slot_count * 8 + 4
+    for stored_labels in hash_slots:
+        slots += (len(stored_labels), label_offsets)
         for label in stored_labels:
-            writer.write_uint8(len(label))
-            writer.write_string(label)
-            writer.write_uint32(index_map[label])
+            label_data += LENGTH_BYTES[len(label)]
+            label_data += label.encode("UTF-8")
+            label_data += index_map[label].to_bytes(4, byteorder)
+            label_offsets += len(label) + 5
+
+    # The slot count and the slots are written as one table, followed by all the labels
+    writer.write_uint32_array([slot_count, *slots])
+    writer.write_bytes(label_data)
+
+
+def get_hash_table_stats(labels: list[str], slot_count: int) -> HashTableStats:
+    """
+    Calculates the statistics of the slots of a label hash table.
+
+    :param labels: the labels in the table.
+    :param slot_count: the amount of slots in the table.
+
+    =====
+    Usage
+    =====
+    >>> stats = get_hash_table_stats([entry.name for entry in msbt], msbt.slot_count)
+    >>> print(stats.longest_chain)
+    """
+    chains = _get_chain_lengths([_calculate_label_hash(label) for label in labels], slot_count)
+    return HashTableStats(slot_count, len(labels), len(chains) - chains.count(0), max(chains, default=0))
+
+
+def get_optimal_slot_count(labels: list[str], load_factor: float = DEFAULT_LOAD_FACTOR) -> int:
+    """
+    Picks a slot count for a set of labels.
+
+    The smallest prime that keeps the table within the load factor is used as a start, and of the next few
+    primes the one that results in the shortest longest chain is picked.
+
+    :param labels: the labels in the table.
+    :param load_factor: the target amount of labels per slot.
+    """
+    if load_factor <= 0:
+        raise ValueError("The load factor must be positive!")
+
+    hashes = [_calculate_label_hash(label) for label in labels]
+
+    best_slot_count = best_chain = None
+    slot_count = _get_next_prime(max(2, math.ceil(len(labels) / load_factor)))
+    for _ in range(SLOT_COUNT_CANDIDATES):
+        longest_chain = max(_get_chain_lengths(hashes, slot_count), default=0)
+        if best_chain is None or longest_chain < best_chain:
+            best_slot_count, best_chain = slot_count, longest_chain
+
+        slot_count = _get_next_prime(slot_count + 1)
+
+    return best_slot_count
+
+
+def _get_chain_lengths(hashes: list[int], slot_count: int) -> list[int]:
+    chains = [0] * slot_count
+    for hash in hashes:
+        chains[hash % slot_count] += 1
+    return chains
+
+
+def _get_next_prime(number: int) -> int:
+    while not _is_prime(number):
+        number += 1
+    return number
+
+
+def _is_prime(number: int) -> bool:
+    if number < 2:
+        return False
+    if number % 2 == 0:
+        return number == 2
+    return all(number % divisor for divisor in range(3, math.isqrt(number) + 1, 2))
 
 
 #  See https://nintendo-formats.com/libs/lms/overview.html#hash-tables
-def _calculate_hash(label: str, slot_count: int) -> int:
+# The hash does not depend on the slot count, so it is cached for labels that are written again
+@lru_cache(maxsize=1 << 16)
+def _calculate_label_hash(label: str) -> int:
     hash = 0
     for character in label:
         hash = hash * 0x492 + ord(character)
-    return (hash & 0xFFFFFFFF) % slot_count
+    return hash & 0xFFFFFFFF
+
+
+def _calculate_hash(label: str, slot_count: int) -> int:
+    return _calculate_label_hash(label) % slot_count
@@ -1,23 +1,54 @@
-from typing import Any, Callable, Generator
+from dataclasses import dataclass
+from typing import Any, Callable
 
 from lms.fileio.io import FileReader, FileWriter
 
+SECTION_HEADER_SIZE = 16
 
-def read_section_data(
-        reader: FileReader, section_count: int
-) -> Generator[tuple[str, int], Any, None]:
-    reader.seek(0x20)
-    for _ in range(section_count):
-        magic = reader.read_string_len(4)
-        size = reader.read_uint32()
 
-        reader.skip(8)
-        end = reader.tell() + size
+@dataclass(frozen=True)
+class SectionInfo:
+    """The location of a section in a file."""
+
+    magic: str
+    offset: int
+    size: int
+
+
+def read_section_directory(reader: FileReader, section_count: int) -> list[SectionInfo]:
+    """
+    Reads the header of every section, without reading any of the section data.
+
+    :param reader: the reader of the file.
+    :param section_count: the amount of sections in the file.
+    """
+
+    def read_header(position: int) -> tuple[str, int]:
+        reader.seek(position)
+        return reader.read_string_len(4), reader.read_uint32()
+
+    return walk_section_headers(read_header, section_count)
+
+
+def walk_section_headers(read_header: Callable[[int], tuple[str, int]], section_count: int) -> list[SectionInfo]:
+    """
+    Walks the header of every section, from the end of the file header.
+
+    :param read_header: a callable that reads the magic and size of the section header at a position.
+    :param section_count: the amount of sections in the file.
+    """
+    sections = []
+
+    position = 0x20
+    for _ in range(section_count):
+        magic, size = read_header(position)
 
-        yield (magic, size)
+        # The data follows the 16 byte header, and each section is aligned to 16 bytes
+        offset = position + SECTION_HEADER_SIZE
+        sections.append(SectionInfo(magic, offset, size))
+        position = offset + size + (-size % 16)
 
-        reader.seek(end)
-        reader.align(16)
+    return sections
 
 
 def write_section(
@@ -28,9 +59,7 @@ def write_section(
         *write_arguments: Any,
 ) -> None:
     writer.write_string(magic)
-    size_offset = writer.tell()
-
-    writer.write_uint32(0)
+    size_offset = writer.reserve_uint32()
     writer.write_bytes(b"\x00" * 8)
     data_start = writer.tell()
 
@@ -39,20 +68,22 @@ def write_section(
     _write_end_data(writer, data_start, size_offset)
 
 
-def write_unsupported_section(writer: FileWriter, magic: str, data: bytes) -> None:
+def write_raw_section(writer: FileWriter, magic: str, data: bytes | memoryview) -> None:
+    write_section_header(writer, magic, len(data))
+    writer.write_bytes(data)
+    writer.write_alignment(b"\xab", 16)
+
+
+def write_section_header(writer: FileWriter, magic: str, size: int) -> None:
     writer.write_string(magic)
-    size_offset = writer.tell()
-    writer.write_uint32(0)
+    writer.write_uint32(size)
     writer.write_bytes(b"\x00" * 8)
-    data_start = writer.tell()
-    writer.write_bytes(data)
-    _write_end_data(writer, data_start, size_offset)
+
+
+def get_section_padding(size: int) -> bytes:
+    return b"\xab" * (-size % 16)
 
 
 def _write_end_data(writer: FileWriter, data_start: int, size_offset: int) -> None:
-    end = writer.tell()
-    size = end - data_start
-    writer.seek(size_offset)
-    writer.write_uint32(size)
-    writer.seek(end)
+    writer.patch_uint32(size_offset, writer.tell() - data_start)
     writer.write_alignment(b"\xab", 16)
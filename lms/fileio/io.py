@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import array
+import mmap
 import struct
-from typing import BinaryIO, Generator
+import sys
+from typing import BinaryIO
 
-from io import BytesIO, IOBase
+from io import IOBase
 from lms.fileio.encoding import FileEncoding
 
 STRUCT_TYPES = {
@@ -28,78 +31,166 @@ STRUCT_TYPES = {
 }
 
 
+STRUCT_CODECS = {
+    endian: {name: struct.Struct(fmt) for name, fmt in types.items()}
+    for endian, types in STRUCT_TYPES.items()
+}
+
+
 class FileReader:
-    def __init__(self, data: BinaryIO | bytes, big_endian: bool = False):
+    def __init__(self, data: BinaryIO | bytes | bytearray | memoryview | mmap.mmap, big_endian: bool = False):
+        # Memory maps are read in place so raw slices can reference the mapping
+        self.is_mapped = isinstance(data, mmap.mmap)
+
+        self._data: bytes | mmap.mmap | None
         if isinstance(data, IOBase):
-            self._stream = data
-        elif isinstance(data, (bytes, bytearray, memoryview)):
-            self._stream = BytesIO(data)
+            # Streams are read in full so that every read is served from one buffer
+            if data.seekable():
+                data.seek(0)
+            self._data = data.read()
+        elif isinstance(data, (bytes, mmap.mmap)):
+            self._data = data
+        elif isinstance(data, memoryview):
+            # Views are read in place as well, and are only copied once the data has to be searched
+            self._data = None
+        elif isinstance(data, bytearray):
+            # The bytearray is copied, as a view of it would stop the caller from resizing it
+            self._data = bytes(data)
         else:
             raise TypeError("The stream provided is not valid!")
 
+        self._buffer = memoryview(self._data) if self._data is not None else data.cast("B")
+        self._reads_views = self.is_mapped or self._data is None
+
+        self._position = 0
+
         self.encoding = FileEncoding.UTF8
         self.is_big_endian = big_endian
 
+    @property
+    def is_big_endian(self) -> bool:
+        return self._is_big_endian
+
+    @is_big_endian.setter
+    def is_big_endian(self, value: bool) -> None:
+        # The struct codecs are chosen once for the endianness instead of on every read
+        self._is_big_endian = value
+        codecs = STRUCT_CODECS["little" if not value else "big"]
+
+        self._unpack_int8 = codecs["int8"].unpack_from
+        self._unpack_int16 = codecs["int16"].unpack_from
+        self._unpack_int32 = codecs["int32"].unpack_from
+        self._unpack_uint8 = codecs["uint8"].unpack_from
+        self._unpack_uint16 = codecs["uint16"].unpack_from
+        self._unpack_uint32 = codecs["uint32"].unpack_from
+        self._unpack_float = codecs["float"].unpack_from
+
     def tell(self) -> int:
-        return self._stream.tell()
+        return self._position
+
+    def get_stream_size(self) -> int:
+        return len(self._buffer)
 
     def skip(self, length: int) -> None:
-        self._stream.read(length)
+        self._position = min(self._position + length, len(self._buffer))
 
     def align(self, alignment: int) -> None:
         alignment = (-self.tell() % alignment + alignment) % alignment
         self.skip(alignment)
 
     def read_bytes(self, length: int) -> bytes:
-        return self._stream.read(length)
+        if self._data is None:
+            data = self._buffer[self._position:self._position + length].tobytes()
+        else:
+            data = self._data[self._position:self._position + length]
+        self._position += len(data)
+        return data
+
+    def read_slice(self, length: int) -> bytes | memoryview:
+        if not self._reads_views:
+            return self.read_bytes(length)
+
+        view = self._buffer[self._position:self._position + length]
+        self._position += len(view)
+        return view
+
+    def get_view(self, offset: int, length: int) -> memoryview:
+        """Returns a view of the data at an offset without moving the position."""
+        return self._buffer[offset:offset + length]
 
     def seek(self, offset: int, whence: int = 0) -> None:
         if offset < 0:
-            self._stream.seek(self.tell() + offset)
+            self._position = self._position + offset
+        elif whence == 1:
+            self._position += offset
+        elif whence == 2:
+            self._position = len(self._buffer) + offset
         else:
-            self._stream.seek(offset, whence)
+            self._position = offset
 
-    def read_offset_array(self, count: int) -> Generator[int, None, None]:
+    def read_offset_array(self, count: int) -> list[int]:
         start = self.tell() - 4
-        for _ in range(count):
-            last = self.tell() + 4
-            yield self.read_uint32() + start
-            self.seek(last)
+        return [offset + start for offset in self.read_uint32_array(count)]
+
+    def read_uint16_array(self, count: int) -> array.array:
+        return self._read_array("H", count)
 
-    def read_uint16_array(self, count: int) -> list[int]:
-        return [self.read_uint16() for _ in range(count)]
+    def read_uint32_array(self, count: int) -> array.array:
+        return self._read_array("I", count)
 
     def read_int8(self) -> int:
-        return struct.unpack(self._get_datatype("int8"), self._stream.read(1))[0]
+        value = self._unpack_int8(self._buffer, self._position)[0]
+        self._position += 1
+        return value
 
     def read_int16(self) -> int:
-        return struct.unpack(self._get_datatype("int16"), self._stream.read(2))[0]
+        value = self._unpack_int16(self._buffer, self._position)[0]
+        self._position += 2
+        return value
 
     def read_int32(self) -> int:
-        return struct.unpack(self._get_datatype("int32"), self._stream.read(4))[0]
+        value = self._unpack_int32(self._buffer, self._position)[0]
+        self._position += 4
+        return value
 
     def read_uint8(self) -> int:
-        return struct.unpack(self._get_datatype("uint8"), self._stream.read(1))[0]
+        value = self._unpack_uint8(self._buffer, self._position)[0]
+        self._position += 1
+        return value
 
     def read_uint16(self) -> int:
-        return struct.unpack(self._get_datatype("uint16"), self._stream.read(2))[0]
+        value = self._unpack_uint16(self._buffer, self._position)[0]
+        self._position += 2
+        return value
 
     def read_uint32(self) -> int:
-        return struct.unpack(self._get_datatype("uint32"), self._stream.read(4))[0]
+        value = self._unpack_uint32(self._buffer, self._position)[0]
+        self._position += 4
+        return value
 
     def read_float32(self) -> float:
-        return struct.unpack(self._get_datatype("float"), self._stream.read(4))[0]
+        value = self._unpack_float(self._buffer, self._position)[0]
+        self._position += 4
+        return value
+
+    def read_struct(self, codec: struct.Struct) -> tuple:
+        values = codec.unpack_from(self._buffer, self._position)
+        self._position += codec.size
+        return values
 
     def read_string_len(self, length: int) -> str:
-        return self._stream.read(length).decode("UTF-8")
+        return self.read_bytes(length).decode("UTF-8")
 
     def read_encoded_string(self):
-        message = b""
-        while (
-                raw_char := self.read_bytes(self.encoding.width)
-        ) != self.encoding.terminator:
-            message += raw_char
-        return message.decode(self.encoding.to_string_format(self.is_big_endian))
+        start = self._position
+        end = self.find_aligned(self.encoding.terminator, start)
+        if end == -1:
+            end = len(self._buffer)
+
+        self._position = min(end + self.encoding.width, len(self._buffer))
+        return self._get_data()[start:end].decode(
+            self.encoding.to_string_format(self.is_big_endian)
+        )
 
     def read_len_string_encoded(self):
         self.align(self.encoding.width)
@@ -108,82 +199,166 @@ class FileReader:
             self.encoding.to_string_format(self.is_big_endian)
         )
 
-    def _get_datatype(self, name: str) -> str:
-        return STRUCT_TYPES["little" if not self.is_big_endian else "big"][name]
+    def find_aligned(self, sub: bytes, start: int, end: int | None = None) -> int:
+        """
+        Finds the first occurrence of ``sub`` that starts on a code unit boundary of the encoding.
+
+        Boundaries are counted from ``start``, so a match that straddles two code units is skipped.
+        Returns -1 if there is no aligned occurrence before ``end``.
+        """
+        width = self.encoding.width
+        if end is None:
+            end = len(self._buffer)
+
+        data = self._get_data()
+        index = data.find(sub, start, end)
+        while index != -1 and (misalignment := (index - start) % width):
+            index = data.find(sub, index + width - misalignment, end)
+        return index
+
+    def _read_array(self, typecode: str, count: int) -> array.array:
+        values = array.array(typecode)
+        end = self._position + values.itemsize * count
+        values.frombytes(self._buffer[self._position:end])
+        self._position = end
+
+        # The whole table is swapped at once when the file and machine byte orders differ
+        if self.is_big_endian != (sys.byteorder == "big"):
+            values.byteswap()
+        return values
+
+    def _get_data(self) -> bytes | mmap.mmap:
+        # Memoryviews can't be searched, so the data is copied once on the first search
+        if self._data is None:
+            self._data = self._buffer.tobytes()
+        return self._data
 
 
 class FileWriter:
     def __init__(self, encoding: FileEncoding):
-        self.data = BytesIO(b"")
+        # Data is only ever appended, values at earlier offsets are filled in with the patch methods
+        self._data = bytearray()
+
         self.encoding = encoding
         self.is_big_endian = False
 
+    @property
+    def is_big_endian(self) -> bool:
+        return self._is_big_endian
+
+    @is_big_endian.setter
+    def is_big_endian(self, value: bool) -> None:
+        self._is_big_endian = value
+        codecs = STRUCT_CODECS["little" if not value else "big"]
+
+        self._pack_int8 = codecs["int8"].pack
+        self._pack_int16 = codecs["int16"].pack
+        self._pack_int32 = codecs["int32"].pack
+        self._pack_uint8 = codecs["uint8"].pack
+        self._pack_uint16 = codecs["uint16"].pack
+        self._pack_uint32 = codecs["uint32"].pack
+        self._pack_float = codecs["float"].pack
+        self._pack_uint32_into = codecs["uint32"].pack_into
+
     def skip(self, length: int) -> None:
-        self.data.seek(length, 1)
+        self._data += bytes(length)
 
     def get_stream_size(self) -> int:
-        last_position = self.tell()
-        self.seek(0, 2)
-        size = self.tell()
-        self.seek(last_position)
-        return size
+        return len(self._data)
 
-    def write_bytes(self, data: bytes) -> None:
-        self.data.write(data)
+    def write_bytes(self, data: bytes | bytearray | memoryview) -> None:
+        self._data += data
 
     def seek(self, offset: int, whence: int = 0) -> None:
-        self.data.seek(offset, whence)
+        # The position is always the end of the data, so both relative modes are the same
+        if whence in (1, 2):
+            offset += len(self._data)
+
+        if offset < len(self._data):
+            raise ValueError(
+                "The writer can not seek backward. Reserve the data and patch it instead."
+            )
+
+        self.skip(offset - len(self._data))
 
     def tell(self) -> int:
-        return self.data.tell()
+        return len(self._data)
 
     def write_alignment(self, data: bytes, alignment: int) -> None:
         self.write_bytes(data * self._align(self.tell(), alignment))
 
     def write_uint16_array(self, array: list[int]) -> None:
-        for number in array:
-            self.write_uint16(number)
+        self._data += self._pack_array("H", array)
+
+    def write_uint32_array(self, array: list[int]) -> None:
+        self._data += self._pack_array("I", array)
+
+    def reserve_uint32(self) -> int:
+        """Writes a placeholder for a uint32 that is filled in later, and returns its offset."""
+        offset = len(self._data)
+        self._data += bytes(4)
+        return offset
+
+    def reserve_bytes(self, length: int) -> int:
+        """Writes a zeroed placeholder that is filled in later, and returns its offset."""
+        offset = len(self._data)
+        self._data += bytes(length)
+        return offset
+
+    def patch_uint32(self, offset: int, value: int) -> None:
+        """Writes a uint32 at an already written offset."""
+        self._pack_uint32_into(self._data, offset, value)
+
+    def patch_uint32_array(self, offset: int, array: list[int]) -> None:
+        """Writes an array of uint32 at an already written offset."""
+        data = self._pack_array("I", array)
+        self._data[offset:offset + len(data)] = data
 
     def write_int8(self, value: int) -> None:
-        self.data.write(struct.pack(self._get_datatype("int8"), value))
+        self._data += self._pack_int8(value)
 
     def write_int16(self, value: int) -> None:
-        self.data.write(struct.pack(self._get_datatype("int16"), value))
+        self._data += self._pack_int16(value)
 
     def write_int32(self, value: int) -> None:
-        self.data.write(struct.pack(self._get_datatype("int32"), value))
+        self._data += self._pack_int32(value)
 
     def write_uint8(self, value: int) -> None:
-        self.data.write(struct.pack(self._get_datatype("uint8"), value))
+        self._data += self._pack_uint8(value)
 
     def write_uint16(self, value: int) -> None:
-        self.data.write(struct.pack(self._get_datatype("uint16"), value))
+        self._data += self._pack_uint16(value)
 
     def write_uint32(self, value: int) -> None:
-        self.data.write(struct.pack(self._get_datatype("uint32"), value))
+        self._data += self._pack_uint32(value)
 
     def write_float32(self, value: float) -> None:
-        self.data.write(struct.pack(self._get_datatype("float"), value))
+        self._data += self._pack_float(value)
 
     def write_string(self, string: str):
-        self.write_bytes(string.encode("UTF-8"))
+        self._data += string.encode("UTF-8")
 
     def write_len_encoded_string(self, string: str) -> None:
         self.write_uint16(len(string) * self.encoding.width)
         self.write_encoded_string(string, False)
 
     def write_encoded_string(self, string: str, terminate: bool = True):
-        self.write_bytes(
-            string.encode(self.encoding.to_string_format(self.is_big_endian))
-        )
+        self._data += string.encode(self.encoding.to_string_format(self.is_big_endian))
         if terminate:
-            self.write_bytes(b"\x00" * self.encoding.width)
+            self._data += self.encoding.terminator
+
+    def _pack_array(self, typecode: str, values: list[int]) -> bytes:
+        data = array.array(typecode, values)
+        if self.is_big_endian != (sys.byteorder == "big"):
+            data.byteswap()
+        return data.tobytes()
 
     def _align(self, number: int, alignment: int) -> int:
         return (-number % alignment + alignment) % alignment
 
-    def _get_datatype(self, name: str) -> str:
-        return STRUCT_TYPES["little" if not self.is_big_endian else "big"][name]
-
     def get_data(self) -> bytes:
-        return self.data.getvalue()
+        return bytes(self._data)
+
+    def get_buffer(self) -> memoryview:
+        """Returns a view of the written data without copying it. The writer can't be written to while the view exists."""
+        return memoryview(self._data)
@@ -0,0 +1,147 @@
+"""
+Optional NumPy integration for reading and editing attributes in bulk.
+
+Attributes are exposed as a structured array, where every field of the attribute config is a named column.
+String fields are stored as their offsets into the ATR1 section, list fields as their item index, and bool
+and byte fields as ``uint8``.
+
+Requires NumPy, which can be installed with ``pip install PyLibMS[numpy]``.
+"""
+
+from lms.common.lms_datatype import LMS_DataType
+from lms.message.msbt import MSBT
+from lms.titleconfig.definitions.attribute import AttributeConfig
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "NumPy is required for attribute arrays. Install it with 'pip install PyLibMS[numpy]'."
+    ) from e
+
+__all__ = ["get_attribute_dtype", "get_attribute_array", "set_attribute_array"]
+
+DTYPE_FORMATS = {
+    LMS_DataType.UINT8: "u1",
+    LMS_DataType.UINT16: "u2",
+    LMS_DataType.UINT32: "u4",
+    LMS_DataType.INT8: "i1",
+    LMS_DataType.INT16: "i2",
+    LMS_DataType.INT32: "i4",
+    LMS_DataType.FLOAT32: "f4",
+    LMS_DataType.STRING: "u4",
+    LMS_DataType.LIST: "u1",
+    LMS_DataType.BOOL: "u1",
+    LMS_DataType.BYTES: "u1",
+}
+
+
+def get_attribute_dtype(
+        config: AttributeConfig, is_big_endian: bool = False, size_per_attribute: int | None = None
+) -> np.dtype:
+    """
+    Creates the structured dtype of an attribute config.
+
+    :param config: the attribute config.
+    :param is_big_endian: if the attributes are big endian.
+    :param size_per_attribute: the size of each attribute. Defaults to the size of the config fields.
+
+    =====
+    Usage
+    =====
+    >>> dtype = get_attribute_dtype(config.get_attribute_config("Main"), msbt.info.is_big_endian)
+    """
+    byte_order = "<" if not is_big_endian else ">"
+    layout = config.layout
+
+    if size_per_attribute is None:
+        size_per_attribute = layout.size
+    elif size_per_attribute < layout.size:
+        raise ValueError(
+            f"The attribute size of {size_per_attribute} is smaller than the config layout of {layout.size}!"
+        )
+
+    return np.dtype(
+        {
+            "names": [definition.name for definition in config.definitions],
+            "formats": [byte_order + DTYPE_FORMATS[definition.datatype] for definition in config.definitions],
+            "offsets": layout.field_offsets,
+            "itemsize": size_per_attribute,
+        }
+    )
+
+
+def get_attribute_array(file: MSBT, config: AttributeConfig) -> np.ndarray:
+    """
+    Retrieves the attributes of a MSBT as a structured array.
+
+    If the ATR1 section was not modified since it was read, the array is a read-only view of the section data.
+    Otherwise, the array is built from the encoded attributes. Use ``copy`` on a view to edit the values.
+
+    :param file: the MSBT object.
+    :param config: the attribute config of the attributes.
+
+    =====
+    Usage
+    =====
+    >>> attributes = get_attribute_array(msbt, config.get_attribute_config("Main")).copy()
+    >>> attributes["price"] *= 2
+    >>> set_attribute_array(msbt, config.get_attribute_config("Main"), attributes)
+    """
+    if not file.contains_attributes:
+        raise ValueError("The MSBT does not contain attributes!")
+
+    dtype = get_attribute_dtype(config, file.info.is_big_endian, file.size_per_attribute)
+
+    # The attributes follow the attribute count and size in the section
+    data = file.get_unmodified_section_data("ATR1")
+    if data is not None:
+        return np.frombuffer(data, dtype, len(file), offset=8)
+
+    if not file.uses_encoded_attributes:
+        raise ValueError(
+            "Decoded attributes that were modified can't be converted to an array. Read the file without an attribute config instead."
+        )
+
+    data = bytearray().join(entry.attribute for entry in file)
+    return np.frombuffer(data, dtype, len(file))
+
+
+def set_attribute_array(file: MSBT, config: AttributeConfig, array: np.ndarray) -> None:
+    """
+    Replaces the attributes of a MSBT with the records of a structured array.
+
+    The file must have been read without an attribute config, as string fields are offsets into its string table.
+    The array must have the dtype of ``get_attribute_dtype`` for the config and the byte order and attribute size of the file.
+
+    :param file: the MSBT object.
+    :param config: the attribute config of the attributes.
+    :param array: the structured array, with a record for each entry.
+
+    =====
+    Usage
+    =====
+    >>> set_attribute_array(msbt, config.get_attribute_config("Main"), attributes)
+    >>> write_msbt_path("path/to/file.msbt", msbt)
+    """
+    if "ATR1" in file.unloaded_sections:
+        raise ValueError("Attributes can't be set when the ATR1 section was not loaded!")
+
+    if not file.uses_encoded_attributes:
+        raise ValueError("Attribute arrays can only be set on files with encoded attributes!")
+
+    if array.dtype.names is None or array.ndim != 1:
+        raise ValueError("The attributes must be a one dimensional structured array!")
+
+    if len(array) != len(file):
+        raise ValueError(f"Expected {len(file)} attributes, got {len(array)}.")
+
+    # The records are copied as raw bytes, so the byte order and offset of every field must match the file
+    dtype = get_attribute_dtype(config, file.info.is_big_endian, file.size_per_attribute)
+    if array.dtype != dtype:
+        raise ValueError(f"Expected attributes of dtype {dtype}, got {array.dtype}.")
+
+    size = dtype.itemsize
+    data = memoryview(array.tobytes())
+    for i, entry in enumerate(file):
+        entry.attribute = data[i * size:(i + 1) * size]
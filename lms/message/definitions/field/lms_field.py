@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 
 from lms.common.lms_datatype import LMS_DataType
+from lms.titleconfig.definitions.attribute import AttributeConfig
 from lms.titleconfig.definitions.value import ValueDefinition
 
 FLOAT32_MIN = -3.4028235e38
@@ -34,6 +35,11 @@ class LMS_FieldMap:
 
         self.fields[name].value = value
 
+    @property
+    def is_modified(self) -> bool:
+        """If any field value was changed since the map was created."""
+        return any(field.is_modified for field in self.fields.values())
+
     def to_dict(self) -> dict[str, FieldValue]:
         """Converts the field map to a regular dictionary."""
         return {field.name: field.value for field in self.fields.values()}
@@ -91,6 +97,94 @@ class LMS_FieldMap:
         return cls(fields)
 
 
+class LMS_LazyFieldMap(LMS_FieldMap):
+    """
+    A field map backed by the encoded data of an attribute. Each field is only decoded once it is first accessed.
+
+    Accessing a field by name only decodes that field, while iterating or converting the map decodes every field.
+    """
+
+    def __init__(
+            self,
+            data: bytes | memoryview,
+            config: AttributeConfig,
+            is_big_endian: bool,
+            read_string: Callable[[int], str],
+            trusted: bool = False,
+    ):
+        # The map is frozen like its base, so the state is set directly
+        self.__dict__.update(
+            _data=data,
+            _config=config,
+            _is_big_endian=is_big_endian,
+            _read_string=read_string,
+            _trusted=trusted,
+            _values=None,
+            _decoded={},
+        )
+
+    @property
+    def fields(self) -> dict[str, LMS_Field]:
+        return {definition.name: self._get_field(definition.name) for definition in self._config.definitions}
+
+    @property
+    def config(self) -> AttributeConfig:
+        """The attribute config of the map."""
+        return self._config
+
+    @property
+    def is_modified(self) -> bool:
+        return any(field.is_modified for field in self._decoded.values())
+
+    def __getitem__(self, name: str) -> LMS_Field:
+        return self._get_field(name)
+
+    def __setitem__(self, name: str, value: FieldValue) -> None:
+        self._get_field(name).value = value
+
+    def detach(self) -> None:
+        """Decodes every field and copies the encoded data, so the map no longer references the data it was read from."""
+        for definition in self._config.definitions:
+            self._get_field(definition.name)
+
+        self.__dict__.update(_data=bytes(self._data), _read_string=None)
+
+    def get_encoded_data(self, is_big_endian: bool) -> bytes | memoryview | None:
+        """
+        Returns the original encoded data if no field was modified and the endianness matches.
+
+        String fields are stored as offsets into the original section, so they have to be written again.
+
+        :param is_big_endian: if the data is needed in big endian.
+        """
+        if self.is_modified or is_big_endian != self._is_big_endian:
+            return None
+        return self._data
+
+    def _get_field(self, name: str) -> LMS_Field:
+        if name in self._decoded:
+            return self._decoded[name]
+
+        layout = self._config.layout
+        if name not in layout.field_indexes:
+            raise KeyError(f"Field '{name}' does not exist")
+
+        # The attribute is unpacked as a whole on the first access, since that is a single struct call
+        if self._values is None:
+            self.__dict__["_values"] = layout.unpack(self._data, self._is_big_endian)
+
+        index = layout.field_indexes[name]
+        definition = self._config.definitions[index]
+
+        value = self._values[index]
+        if definition.datatype is LMS_DataType.STRING:
+            value = self._read_string(value)
+
+        create_field = LMS_Field.from_trusted if self._trusted else LMS_Field
+        field = self._decoded[name] = create_field(value, definition)
+        return field
+
+
 class LMS_Field:
     """
     A class that represents a mapped value linked to a config definition.
@@ -102,6 +196,21 @@ class LMS_Field:
         _verify_value(value, definition)
         self._definition = definition
         self._value = value
+        self._modified = False
+
+    @classmethod
+    def from_trusted(cls, value: int | str | float | bytes | bool, definition: ValueDefinition) -> LMS_Field:
+        """
+        Creates a field without verifying the value. Only meant for values that were just read from a file.
+
+        :param value: the value of the field.
+        :param definition: the definition of the field.
+        """
+        field = cls.__new__(cls)
+        field._definition = definition
+        field._value = value
+        field._modified = False
+        return field
 
     def __repr__(self):
         if self.datatype is LMS_DataType.LIST:
@@ -137,6 +246,12 @@ class LMS_Field:
     def value(self, new_value: int | str | float | bytes | bool):
         _verify_value(new_value, self._definition)
         self._value = new_value
+        self._modified = True
+
+    @property
+    def is_modified(self) -> bool:
+        """If the value was changed since the field was created."""
+        return self._modified
 
 
 def _verify_value(
@@ -144,36 +259,30 @@ def _verify_value(
 ) -> None:
     datatype = definition.datatype
 
-    if datatype in (LMS_DataType.BOOL, LMS_DataType.STRING):
+    if datatype is LMS_DataType.BOOL or datatype is LMS_DataType.STRING:
         return
 
-    match datatype:
-        case LMS_DataType.BYTES if isinstance(value, bytes):
-            if len(value) != 1:
-                raise ValueError("Byte types only work for values of length 1!")
-            else:
-                return
-        case LMS_DataType.LIST if isinstance(value, str):
+    if datatype is LMS_DataType.LIST:
+        if isinstance(value, str):
             if value not in definition.list_items:
                 raise ValueError(
                     f"""The value of '{value}' provided for field '{definition.name}' is not a 
                     valid item in the list {definition.list_items}."""
                 )
-            else:
-                return
-        case LMS_DataType.FLOAT32 if isinstance(value, float):
-            _verify_number_is_in_range(value, FLOAT32_MIN, FLOAT32_MAX, definition)
             return
-        case _ if isinstance(value, int):
-            bits = datatype.stream_size * 8
-            if datatype.signed:
-                max_value = 2 ** (bits - 1)
-                min_value = -max_value
-            else:
-                min_value, max_value = 0, (2 ** bits) - 1
-
-            _verify_number_is_in_range(value, min_value, max_value, definition)
+    elif datatype is LMS_DataType.BYTES:
+        if isinstance(value, bytes):
+            if len(value) != 1:
+                raise ValueError("Byte types only work for values of length 1!")
             return
+    elif datatype is LMS_DataType.FLOAT32 and isinstance(value, float):
+        _verify_number_is_in_range(value, FLOAT32_MIN, FLOAT32_MAX, definition)
+        return
+    elif isinstance(value, int):
+        # The range is cached on the definition, so it isn't looked up for every value
+        min_value, max_value = definition.integer_range
+        _verify_number_is_in_range(value, min_value, max_value, definition)
+        return
 
     raise TypeError(
         f"The value provided for '{definition.name}' type '{type(value)}' should be '{datatype.builtin_type}'."
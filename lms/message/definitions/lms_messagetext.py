@@ -1,10 +1,14 @@
+from __future__ import annotations
+
 import re
+from typing import Callable
 
+from lms.fileio.encoding import FileEncoding
 from lms.message.definitions.field.lms_field import LMS_FieldMap, FieldValue
 from lms.message.tag.lms_tag import (LMS_ControlTag, LMS_DecodedTag,
                                      LMS_EncodedTag, is_tag)
 from lms.message.tag.lms_tagexceptions import LMS_TagForbiddenParametersError
-from lms.titleconfig.config import TagConfig
+from lms.titleconfig.definitions.tags import TagConfig
 
 
 class LMS_MessageText:
@@ -19,19 +23,107 @@ class LMS_MessageText:
     ):
         self._tag_config = tag_config
 
+        self._encoded_data: bytes | memoryview | None = None
+        self._encoded_format: tuple[FileEncoding, bool] | None = None
+        self._decoder: Callable[[], list[str | LMS_ControlTag]] | None = None
+
+        # The text of each tag when the message was decoded, as tags can be edited in place
+        self._source_tags: list[str] | None = None
+
         if isinstance(message, str):
             self._set_segments(message)
         else:
-            self._segments = message
+            self._segment_list = message
 
     def __iter__(self):
-        return iter(self._segments)
+        return iter(self._get_decoded_segments())
+
+    @classmethod
+    def from_encoded(
+            cls,
+            data: bytes | memoryview,
+            encoding: FileEncoding,
+            is_big_endian: bool,
+            decoder: Callable[[], list[str | LMS_ControlTag]] | None = None,
+            tag_config: TagConfig | None = None,
+            *,
+            segments: list[str | LMS_ControlTag] | None = None,
+    ):
+        """
+        Creates a message from its encoded data. The segments are only decoded once they are first needed.
+
+        :param data: the encoded message data.
+        :param encoding: the encoding of the data.
+        :param is_big_endian: if the data is big endian.
+        :param decoder: a callable that decodes the data into the message segments.
+        :param tag_config: the tag config used by the decoder.
+        :param segments: the already decoded segments, if any.
+        """
+        if decoder is None and segments is None:
+            raise ValueError("Either a decoder or the decoded segments must be provided!")
+
+        message = cls([], tag_config)
+        message._segment_list = segments
+        message._encoded_data = data
+        message._encoded_format = (encoding, is_big_endian)
+        message._decoder = decoder
+        if segments is not None:
+            message._source_tags = _get_tag_text(segments)
+        return message
+
+    @property
+    def is_modified(self) -> bool:
+        """
+        If the message may differ from the encoded data it was read from.
+
+        Setting the text or appending tags modifies the message. Tags that were edited in place
+        are found by comparing them to their text when the message was decoded.
+        """
+        if self._encoded_data is None:
+            return True
+
+        if self._segment_list is None:
+            return False
+
+        return _get_tag_text(self._segment_list) != self._source_tags
+
+    def _get_decoded_segments(self) -> list[str | LMS_ControlTag]:
+        if self._segment_list is None:
+            self._segment_list = self._decoder()
+            self._source_tags = _get_tag_text(self._segment_list)
+        return self._segment_list
+
+    def _get_modified_segments(self) -> list[str | LMS_ControlTag]:
+        # The segment list is about to be changed, so the encoded data is no longer the source of the message
+        segments = self._get_decoded_segments()
+        self._encoded_data = self._decoder = None
+        return segments
+
+    def detach(self) -> None:
+        """Decodes the message and copies its encoded data, so it no longer references the data it was read from."""
+        self._get_decoded_segments()
+        if self._encoded_data is not None:
+            self._encoded_data = bytes(self._encoded_data)
+        self._decoder = None
+
+    def get_encoded_data(
+            self, encoding: FileEncoding, is_big_endian: bool
+    ) -> bytes | memoryview | None:
+        """
+        Returns the original encoded data if the message was not modified and the format matches.
+
+        :param encoding: the encoding the data is needed in.
+        :param is_big_endian: if the data is needed in big endian.
+        """
+        if self.is_modified or self._encoded_format != (encoding, is_big_endian):
+            return None
+        return self._encoded_data
 
     @property
     def text(self) -> str:
         """The raw text of the message."""
         result = []
-        for part in self._segments:
+        for part in self._get_decoded_segments():
             if is_tag(part):
                 result.append(part.to_text())
             else:
@@ -45,14 +137,14 @@ class LMS_MessageText:
     @property
     def tags(self) -> list[LMS_ControlTag]:
         """The list of control tags in the message."""
-        return [part for part in self._segments if is_tag(part)]
+        return [part for part in self._get_decoded_segments() if is_tag(part)]
 
     @property
     def tag_positions(self) -> dict[LMS_ControlTag, tuple[int, int]]:
         """Dict of tag objects to their start and end positions in text."""
         positions = {}
         pos = 0
-        for part in self._segments:
+        for part in self._get_decoded_segments():
             text_len = len(part)
             if is_tag(part):
                 positions[part] = (pos, pos + text_len)
@@ -86,7 +178,7 @@ class LMS_MessageText:
                 group_id, tag_index, None if not parameters else list(parameters)
             )
 
-        self._segments.append(tag)
+        self._get_modified_segments().append(tag)
         return tag
 
     def append_decoded_tag(
@@ -120,7 +212,7 @@ class LMS_MessageText:
                 raise LMS_TagForbiddenParametersError("There may not be parameters for closing tags!")
 
             tag = LMS_DecodedTag(definition, is_closing=True)
-            self._segments.append(tag)
+            self._get_modified_segments().append(tag)
             return tag
 
         if parameters:
@@ -129,7 +221,7 @@ class LMS_MessageText:
         else:
             tag = LMS_DecodedTag(definition)
 
-        self._segments.append(tag)
+        self._get_modified_segments().append(tag)
         return tag
 
     def append_tag_string(self, tag: str) -> LMS_ControlTag:
@@ -158,13 +250,18 @@ class LMS_MessageText:
         else:
             raise ValueError(f"Invalid format in tag '{tag}'.")
 
-        self._segments.append(tag_obj)
+        self._get_modified_segments().append(tag_obj)
         return tag_obj
 
     def _set_segments(self, text: str) -> None:
-        self._segments = []
+        self._segment_list = []
+        self._encoded_data = self._decoder = None
         for part in self.TAG_FORMAT.split(text):
             if bool(re.match(self.TAG_FORMAT, part)):
                 self.append_tag_string(part)
             else:
-                self._segments.append(part)
+                self._segment_list.append(part)
+
+
+def _get_tag_text(segments: list[str | LMS_ControlTag]) -> list[str]:
+    return [part.to_text() for part in segments if is_tag(part)]
@@ -1,5 +1,13 @@
+import mmap
+import os
+from typing import Any
+
+from lms.common import lms_exceptions
 from lms.common.lms_fileinfo import LMS_FileInfo
+from lms.common.stream.hashtable import (HashTableStats, get_hash_table_stats,
+                                         get_optimal_slot_count)
 from lms.fileio.encoding import FileEncoding
+from lms.message.definitions.field.lms_field import LMS_FieldMap, LMS_LazyFieldMap
 from lms.message.msbtentry import MSBTEntry
 from lms.titleconfig.definitions.attribute import AttributeConfig
 from lms.titleconfig.definitions.tags import TagConfig
@@ -32,9 +40,10 @@ class MSBT:
             info: LMS_FileInfo | None = None,
             uses_nli1: bool = False,
             section_list: list[str] | None = None,
-            unsupported_section_map: dict[str, bytes] | None = None,
+            unsupported_section_map: dict[str, bytes | memoryview] | None = None,
             attribute_config: AttributeConfig | None = None,
             tag_config: TagConfig | None = None,
+            unloaded_section_map: dict[str, bytes | memoryview] | None = None,
     ):
         self._info = info if info is not None else LMS_FileInfo()
 
@@ -43,19 +52,34 @@ class MSBT:
 
         self.size_per_attribute = 0
 
-        self.slot_count = MSBT.DEFAULT_SLOT_COUNT
+        # The slot count of the label hash table. When None, a slot count is picked from the labels when writing
+        self.slot_count: int | None = MSBT.DEFAULT_SLOT_COUNT
 
         self.uses_encoded_attributes = True
-        self.attr_string_table: bytes | None = None
+        self.attr_string_table: bytes | memoryview | None = None
 
         self._unsupported_section_map = unsupported_section_map or {}
 
+        # Supported sections that were skipped when reading, which are written back as their original data
+        self._unloaded_section_map = unloaded_section_map or {}
+
         # Store the section list so that the order of any and all sections is preserved when writing
         self._section_list: list[str] = section_list or ["LBL1" if not uses_nli1 else "NLI1"]
 
         self._attribute_config = attribute_config
         self._tag_config = tag_config
 
+        # The original data of each section that was read, along with the state it was read into.
+        # A section is only written again when its current state differs from that state
+        self._source_sections: dict[str, bytes | memoryview] = {}
+        self._source_states: dict[str, Any] = {}
+        self._source_format: tuple[bool, FileEncoding] | None = None
+        self._source_labels: list[str] | None = None
+
+        # The memory map the file was read from, which data of the instance may still reference
+        self._memory_map: mmap.mmap | None = None
+        self._memory_map_path: str | None = None
+
     @classmethod
     def new(cls,
             uses_nli1: bool = False,
@@ -89,6 +113,12 @@ class MSBT:
     def __iter__(self):
         return iter(self._entries)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
     @property
     def info(self) -> LMS_FileInfo:
         """The file info for the MSBT instance."""
@@ -109,6 +139,16 @@ class MSBT:
         """The list of unsupported sections."""
         return tuple(self._unsupported_section_map.keys())
 
+    @property
+    def modified_sections(self) -> tuple[str, ...]:
+        """The list of sections that were modified since they were read, with order preserved."""
+        return tuple(name for name in self._section_list if self.is_section_modified(name))
+
+    @property
+    def unloaded_sections(self) -> tuple[str, ...]:
+        """The sections that were not loaded when the file was read. They are written back unchanged."""
+        return tuple(self._unloaded_section_map)
+
     @property
     def uses_nli1(self) -> bool:
         """If the MSBT contains the NLI1 section."""
@@ -168,7 +208,7 @@ class MSBT:
         # we do not need to account for that scenario as they aren't supported by the library
 
         if self.section_exists("ATR1"):
-            if entry.attribute is None:
+            if entry.attribute is None and "ATR1" not in self._unloaded_section_map:
                 raise ValueError(
                     f"Entry '{entry.name}' can't be added with no attributes when attributes already exist!"
                 )
@@ -180,7 +220,7 @@ class MSBT:
             self._section_list.insert(self.TXT2_INDEX, "TXT2")
 
         if self.section_exists("TSY1"):
-            if entry.style_index is None:
+            if entry.style_index is None and "TSY1" not in self._unloaded_section_map:
                 raise ValueError(
                     f"Entry '{entry.name}' can't be added with no style index when styles already exist!"
                 )
@@ -211,7 +251,24 @@ class MSBT:
         """
         return name in self._section_list
 
-    def get_unsupported_section_data(self, name: str) -> bytes:
+    def get_label_stats(self) -> HashTableStats:
+        """
+        Calculates the statistics of the label hash table, with the slot count it is written with.
+
+        =====
+        Usage
+        =====
+        >>> msbt.slot_count = None
+        >>> print(msbt.get_label_stats().longest_chain)
+        """
+        if self.uses_nli1:
+            raise ValueError("The MSBT uses NLI1, which does not have a label hash table!")
+
+        labels = [entry.name for entry in self._entries]
+        slot_count = self.slot_count if self.slot_count is not None else get_optimal_slot_count(labels)
+        return get_hash_table_stats(labels, slot_count)
+
+    def get_unsupported_section_data(self, name: str) -> bytes | memoryview:
         """
         Retrieves the raw data of an unsupported section.
 
@@ -221,3 +278,158 @@ class MSBT:
             raise KeyError(f"The section '{name}' does not exist in the MSBT!")
 
         return self._unsupported_section_map[name]
+
+    def set_source_sections(self, sections: dict[str, bytes | memoryview]) -> None:
+        """
+        Stores the original data of each section and records the current state of the instance.
+        Sections that are not modified afterward are written back as their original data.
+
+        :param sections: dict of section names to their data, excluding the section headers.
+        """
+        self._source_sections = dict(sections)
+        self._source_states = {name: self._get_section_state(name) for name in sections}
+        self._source_format = (self._info.is_big_endian, self._info.encoding)
+        self._source_labels = [entry.name for entry in self._entries]
+
+    def set_memory_map(self, memory_map: mmap.mmap, file_path: str) -> None:
+        """
+        Stores the memory map the file was read from, so that it can be closed with ``close``.
+
+        :param memory_map: the memory map.
+        :param file_path: the path of the mapped file.
+        """
+        self._memory_map = memory_map
+        self._memory_map_path = file_path
+
+    def is_mapped(self, file_path: str) -> bool:
+        """
+        Determines if data of the instance is still read from a memory map of a file.
+
+        :param file_path: the path of the file.
+        """
+        if self._memory_map_path is None or not os.path.exists(file_path):
+            return False
+        return os.path.samefile(file_path, self._memory_map_path)
+
+    def close(self) -> None:
+        """
+        Copies all data that is still read from the memory map of the file into memory, and closes the map.
+        Lazy messages and attributes are decoded in the process. Does nothing if the file was not memory mapped.
+
+        =====
+        Usage
+        =====
+        >>> with read_msbt_path("path/to/file.msbt", memory_map=True) as msbt:
+        ...     print(msbt.get_entry_by_index(0).message.text)
+        """
+        if self._memory_map is None:
+            return
+
+        self._source_sections = {name: bytes(data) for name, data in self._source_sections.items()}
+        self._unsupported_section_map = {name: bytes(data) for name, data in self._unsupported_section_map.items()}
+        self._unloaded_section_map = {name: bytes(data) for name, data in self._unloaded_section_map.items()}
+        self.attr_string_table = _copy_view(self.attr_string_table)
+
+        for entry in self._entries:
+            if isinstance(entry.attribute, LMS_LazyFieldMap):
+                entry.attribute.detach()
+            else:
+                entry.attribute = _copy_view(entry.attribute)
+
+            if entry.message is not None:
+                entry.message.detach()
+
+        # The recorded attribute state references the same data. Copies compare equal, so modifications are still found
+        if "ATR1" in self._source_states:
+            self._source_states["ATR1"] = tuple(
+                [_copy_view(attribute) for attribute in value] if isinstance(value, list) else _copy_view(value)
+                for value in self._source_states["ATR1"]
+            )
+
+        try:
+            self._memory_map.close()
+        except BufferError:
+            raise lms_exceptions.LMS_Error(
+                "The memory map can't be closed while views of it are still referenced, such as attribute arrays!"
+            ) from None
+
+        self._memory_map = self._memory_map_path = None
+
+    def has_modified_entries(self) -> bool:
+        """Determines if any entry was added, removed, renamed or moved since the file was read."""
+        return self._source_labels != [entry.name for entry in self._entries]
+
+    def has_modified_format(self) -> bool:
+        """Determines if the byte order or encoding of the file was changed since the file was read."""
+        return self._source_format is not None and self._source_format != (self._info.is_big_endian, self._info.encoding)
+
+    def is_section_modified(self, name: str) -> bool:
+        """
+        Determines if a section was modified since it was read. Sections that were not read are always modified.
+
+        :param name: the name of the section.
+        """
+        if name in self._unsupported_section_map or name in self._unloaded_section_map:
+            return False
+
+        if name not in self._source_sections:
+            return True
+
+        if self._source_format != (self._info.is_big_endian, self._info.encoding):
+            return True
+
+        if self._get_section_state(name) != self._source_states[name]:
+            return True
+
+        # Attributes and messages are compared by identity above, so any changes made to them in place are checked here
+        match name:
+            case "ATR1":
+                return any(
+                    isinstance(entry.attribute, LMS_FieldMap) and entry.attribute.is_modified
+                    for entry in self._entries
+                )
+            case "TXT2":
+                return any(entry.message.is_modified for entry in self._entries)
+
+        return False
+
+    def get_unmodified_section_data(self, name: str) -> bytes | memoryview | None:
+        """
+        Retrieves the original data of a section, or None if the section was modified since it was read.
+
+        :param name: the name of the section.
+        """
+        if self.is_section_modified(name):
+            return None
+
+        if name in self._unsupported_section_map:
+            return self._unsupported_section_map[name]
+
+        if name in self._unloaded_section_map:
+            return self._unloaded_section_map[name]
+
+        return self._source_sections[name]
+
+    def _get_section_state(self, name: str) -> Any:
+        match name:
+            case "LBL1":
+                return [entry.name for entry in self._entries], self.slot_count
+            case "NLI1":
+                return [entry.name for entry in self._entries]
+            case "ATR1":
+                return (
+                    [entry.attribute for entry in self._entries],
+                    self.uses_encoded_attributes,
+                    self.size_per_attribute,
+                    self.attr_string_table,
+                )
+            case "TXT2":
+                return [entry.message for entry in self._entries]
+            case "TSY1":
+                return [entry.style_index for entry in self._entries]
+
+        return None
+
+
+def _copy_view(data: Any) -> Any:
+    return bytes(data) if isinstance(data, memoryview) else data
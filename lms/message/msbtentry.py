@@ -12,12 +12,13 @@ class MSBTEntry:
             name: str,
             *,
             message: LMS_MessageText | str | None = "",
-            attribute: LMS_FieldMap | bytes | None = None,
+            attribute: LMS_FieldMap | bytes | memoryview | None = None,
             style_index: int | None = None,
     ):
         self.name = name
 
-        if not isinstance(message, (LMS_MessageText, str)):
+        # The message is None when the TXT2 section was not loaded
+        if message is not None and not isinstance(message, (LMS_MessageText, str)):
             raise TypeError(
                 f"An invalid type was provided for text in entry '{name}'! Expected LMS_MessageText object or str got {type(message)}"
             )
@@ -27,13 +28,7 @@ class MSBTEntry:
         else:
             self._message = message
 
-        if attribute is not None and not isinstance(attribute, (LMS_FieldMap, bytes)):
-            raise TypeError(
-                f"An invalid type was provided for attribute in entry '{name}'. "
-                f"Expected LMS_FieldMap or bytes, got {type(attribute)}"
-            )
-
-        self._attribute = attribute
+        self.attribute = attribute
         self.style_index = style_index
 
     @property
@@ -42,10 +37,20 @@ class MSBTEntry:
         return self._message
 
     @property
-    def attribute(self) -> LMS_FieldMap | bytes | None:
+    def attribute(self) -> LMS_FieldMap | bytes | memoryview | None:
         """The attribute for the instance."""
         return self._attribute
 
+    @attribute.setter
+    def attribute(self, attribute: LMS_FieldMap | bytes | memoryview | None) -> None:
+        if attribute is not None and not isinstance(attribute, (LMS_FieldMap, bytes, memoryview)):
+            raise TypeError(
+                f"An invalid type was provided for attribute in entry '{self.name}'. "
+                f"Expected LMS_FieldMap or bytes, got {type(attribute)}"
+            )
+
+        self._attribute = attribute
+
     def to_dict(self) -> dict:
         """Converts the MSBTEntry instance into a dictionary object."""
         result: dict[str, int | str | dict | None] = {
@@ -54,7 +59,7 @@ class MSBTEntry:
         }
 
         if self._attribute is not None:
-            if isinstance(self._attribute, bytes):
+            if isinstance(self._attribute, (bytes, memoryview)):
                 result["attribute"] = self._attribute.hex().upper()
             else:
                 result["attribute"] = self._attribute.to_dict()
@@ -1,20 +1,44 @@
-from typing import BinaryIO
+import mmap
+import os
+import shutil
+import uuid
+from typing import Any, BinaryIO
 
-from lms.common.stream.fileinfo import read_file_info, write_file_info
-from lms.common.stream.hashtable import read_labels, write_labels
-from lms.common.stream.section import (read_section_data, write_section,
-                                       write_unsupported_section)
+from lms.common import lms_exceptions
+from lms.common.stream.fileinfo import (FILE_SIZE_OFFSET, read_file_info,
+                                        write_file_info)
+from lms.common.stream.hashtable import (find_label_index, read_labels,
+                                         write_labels)
+from lms.common.stream.section import (get_section_padding,
+                                       read_section_directory,
+                                       write_raw_section, write_section,
+                                       write_section_header)
 from lms.fileio.io import FileReader, FileWriter
 from lms.message.msbt import MSBT
 from lms.message.msbtentry import MSBTEntry
-from lms.message.section.atr1 import (read_atr1, write_decoded_atr1,
-                                      write_encoded_atr1)
-from lms.message.section.nli1 import read_nli1, write_nli1
-from lms.message.section.tsy1 import read_tsy1, write_tsy1
-from lms.message.section.txt2 import read_txt2, write_txt2
-from lms.titleconfig.config import AttributeConfig, TagConfig
+from lms.message.section.atr1 import (read_atr1, read_single_attribute,
+                                      write_decoded_atr1, write_encoded_atr1)
+from lms.message.section.nli1 import find_nli1_index, read_nli1, write_nli1
+from lms.message.section.tsy1 import read_style_index, read_tsy1, write_tsy1
+from lms.message.section.txt2 import (read_single_message, read_txt2,
+                                      write_txt2)
+from lms.titleconfig.definitions.attribute import AttributeConfig
+from lms.titleconfig.definitions.tags import TagConfig
 
-__all__ = ["read_msbt", "read_msbt_path", "write_msbt", "write_msbt_path"]
+__all__ = [
+    "read_msbt",
+    "read_msbt_path",
+    "lookup_msbt_entry",
+    "write_msbt",
+    "write_msbt_path",
+    "write_msbt_to_stream",
+]
+
+# Sections that can be left unloaded. Entries are created from the labels, so the label sections are always loaded
+SKIPPABLE_SECTIONS = ("ATR1", "TXT2", "TSY1")
+
+# Sections that may be selected when reading
+SECTION_NAMES = ("LBL1", "NLI1", *SKIPPABLE_SECTIONS)
 
 
 def read_msbt_path(
@@ -23,6 +47,11 @@ def read_msbt_path(
         attribute_config: AttributeConfig | None = None,
         tag_config: TagConfig | None = None,
         suppress_tag_errors: bool = False,
+        lazy_messages: bool = False,
+        lazy_attributes: bool = False,
+        trusted: bool = False,
+        sections: set[str] | None = None,
+        memory_map: bool = False,
 ) -> MSBT:
     """
     Reads and retrieves a MSBT file from a given path.
@@ -31,56 +60,114 @@ def read_msbt_path(
     :param attribute_config: the attribute config to use for decoding attributes.
     :param tag_config: the tag config to use for decoding tags.
     :param suppress_tag_errors: when a tag config is used, suppress any errors while reading decoded tags.
+    :param lazy_messages: keep each message as its encoded data and only decode it once it is first needed.
+    :param lazy_attributes: when an attribute config is used, only decode each attribute field once it is first accessed.
+    :param trusted: skip the validation of decoded attribute and tag parameter values.
+    :param sections: the names of the sections to load. Defaults to every section.
+    :param memory_map: read the file through a read-only memory map. Raw attributes, the attribute string table,
+        unsupported sections and lazy message data are then ``memoryview`` slices of the mapping instead of copies.
+        The map stays open until ``close`` is called on the MSBT or the ``with`` block of the MSBT ends.
 
     =====
     Usage
     =====
     >>> msbt = read_msbt_path("path/to/file.msbt")
+    >>> with read_msbt_path("path/to/file.msbt", memory_map=True) as msbt:
+    ...     print(msbt.get_entry_by_index(0).message.text)
     """
     with open(file_path, "rb") as stream:
-        return read_msbt(
+        if memory_map:
+            stream = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+        file = read_msbt(
             stream,
             attribute_config=attribute_config,
             tag_config=tag_config,
             suppress_tag_errors=suppress_tag_errors,
+            lazy_messages=lazy_messages,
+            lazy_attributes=lazy_attributes,
+            trusted=trusted,
+            sections=sections,
         )
 
+    if memory_map:
+        file.set_memory_map(stream, file_path)
+
+    return file
+
 
 def read_msbt(
-        stream: BinaryIO | bytes,
+        stream: BinaryIO | bytes | mmap.mmap,
         *,
         attribute_config: AttributeConfig | None = None,
         tag_config: TagConfig | None = None,
         suppress_tag_errors: bool = False,
+        lazy_messages: bool = False,
+        lazy_attributes: bool = False,
+        trusted: bool = False,
+        sections: set[str] | None = None,
 ) -> MSBT:
     """
     Reads and retrieves a MSBT file from a specified stream.
 
-    :param stream: an ``IOBase``, ``BytesIO``, ``memoryview``, or ``bytes`` object.
+    :param stream: an ``IOBase``, ``BytesIO``, ``memoryview``, ``bytes``, or ``mmap`` object.
     :param attribute_config: the attribute config to use for decoding attributes.
     :param tag_config: the tag config to use for decoding tags.
     :param suppress_tag_errors: when a tag config is used, suppress any errors while reading decoded tags.
+    :param lazy_messages: keep each message as its encoded data and only decode it once it is first needed.
+        Messages that are never decoded are written back unchanged.
+    :param lazy_attributes: when an attribute config is used, only decode each attribute field once it is first accessed.
+        Attributes with no modified fields are written back from their encoded data.
+    :param trusted: skip the validation of decoded attribute and tag parameter values, as they were read from
+        the file itself. Values assigned afterward are still validated.
+    :param sections: the names of the sections to load. Defaults to every section. The label section is always loaded,
+        as entries are created from it. Sections that are not loaded are kept as their original data and written back
+        unchanged, so their values of each entry are None and can't be set, and entries can't be added, removed or renamed.
 
     =====
     Usage
     =====
     >>> msbt = read_msbt_path("path/to/file.msbt")
+    >>> msbt = read_msbt(stream, sections={"LBL1", "TSY1"})
     """
+    if sections is not None and (unknown_sections := set(sections).difference(SECTION_NAMES)):
+        raise ValueError(f"Unknown sections {sorted(unknown_sections)}! Expected any of {SECTION_NAMES}.")
+
     reader = FileReader(stream)
     file_info = read_file_info(reader, MSBT.MAGIC)
 
     section_list = []
     unsupported_sections = {}
+    unloaded_sections = {}
+    source_sections = {}
 
     # While 101 is the default slot count for LBL1 sections in a MSBT
     # The value may be overridden at the instance level... not sure why it varies though...
     slot_count = MSBT.DEFAULT_SLOT_COUNT
 
     messages = atr1_data = style_indexes = None
+    size_per_attribute = 0
 
     labels: dict[int, str] = {}
     uses_nli1 = False
-    for magic, size in read_section_data(reader, file_info.section_count):
+    for section in read_section_directory(reader, file_info.section_count):
+        magic, size = section.magic, section.size
+        if magic not in section_list:
+            section_list.append(magic)
+
+        reader.seek(section.offset)
+        source_sections[magic] = reader.get_view(section.offset, size)
+
+        if sections is not None and magic not in sections and magic in SKIPPABLE_SECTIONS:
+            # The attribute size follows the attribute count, and is kept so unloaded attributes can still be viewed
+            if magic == "ATR1":
+                reader.skip(4)
+                size_per_attribute = reader.read_uint32()
+                reader.seek(section.offset)
+
+            unloaded_sections[magic] = reader.read_slice(size)
+            continue
+
         match magic:
             case "LBL1":
                 labels, slot_count = read_labels(reader)
@@ -88,24 +175,24 @@ def read_msbt(
                 labels = read_nli1(reader)
                 uses_nli1 = True
             case "ATR1":
-                atr1_data = read_atr1(reader, attribute_config, size)
+                atr1_data = read_atr1(reader, attribute_config, size, lazy_attributes, trusted)
             case "TXT2":
-                messages = read_txt2(reader, tag_config, suppress_tag_errors)
+                messages = read_txt2(
+                    reader, tag_config, suppress_tag_errors, size, lazy_messages, trusted
+                )
             case "TSY1":
                 style_indexes = read_tsy1(reader, len(labels))
             case _:
-                unsupported_sections[magic] = reader.read_bytes(size)
-
-        if magic not in section_list:
-            section_list.append(magic)
+                unsupported_sections[magic] = reader.read_slice(size)
 
     file = MSBT(
         file_info, uses_nli1, section_list,
-        unsupported_sections, attribute_config, tag_config
+        unsupported_sections, attribute_config, tag_config, unloaded_sections
     )
     file.slot_count = slot_count
 
     file.uses_encoded_attributes = attribute_config is None
+    file.size_per_attribute = size_per_attribute
     if atr1_data is not None:
         file.size_per_attribute = atr1_data.size_per_attribute
         file.attr_string_table = atr1_data.string_table
@@ -118,13 +205,80 @@ def read_msbt(
             MSBTEntry(label, message=text, attribute=attr, style_index=style)
         )
 
+    file.set_source_sections(source_sections)
     return file
 
 
+def lookup_msbt_entry(
+        stream: BinaryIO | bytes | mmap.mmap,
+        label: str,
+        *,
+        attribute_config: AttributeConfig | None = None,
+        tag_config: TagConfig | None = None,
+        suppress_tag_errors: bool = False,
+        trusted: bool = False,
+) -> MSBTEntry | None:
+    """
+    Retrieves a single entry of a MSBT file by its label, without reading the rest of the file.
+
+    Only the section headers, the hash slot of the label, and the message, attribute and style index of the entry are read.
+    Returns None if the label does not exist.
+
+    :param stream: an ``IOBase``, ``BytesIO``, ``memoryview``, ``bytes``, or ``mmap`` object.
+    :param label: the label of the entry.
+    :param attribute_config: the attribute config to use for decoding the attribute.
+    :param tag_config: the tag config to use for decoding tags.
+    :param suppress_tag_errors: when a tag config is used, suppress any errors while reading decoded tags.
+    :param trusted: skip the validation of decoded attribute and tag parameter values.
+
+    =====
+    Usage
+    =====
+    >>> with open("path/to/file.msbt", "rb") as f:
+    ...     data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    >>> entry = lookup_msbt_entry(data, "Label")
+    """
+    reader = FileReader(stream)
+    file_info = read_file_info(reader, MSBT.MAGIC)
+    sections = {section.magic: section for section in read_section_directory(reader, file_info.section_count)}
+
+    if "LBL1" in sections:
+        reader.seek(sections["LBL1"].offset)
+        index = find_label_index(reader, label)
+    elif "NLI1" in sections:
+        reader.seek(sections["NLI1"].offset)
+        index = find_nli1_index(reader, label)
+    else:
+        return None
+
+    if index is None:
+        return None
+
+    message = ""
+    if "TXT2" in sections:
+        reader.seek(sections["TXT2"].offset)
+        message = read_single_message(reader, index, tag_config, suppress_tag_errors, trusted)
+
+    attribute = None
+    if "ATR1" in sections:
+        reader.seek(sections["ATR1"].offset)
+        attribute = read_single_attribute(reader, attribute_config, index, trusted)
+
+    style_index = None
+    if "TSY1" in sections:
+        reader.seek(sections["TSY1"].offset)
+        style_index = read_style_index(reader, index)
+
+    return MSBTEntry(label, message=message, attribute=attribute, style_index=style_index)
+
+
 def write_msbt_path(file_path: str, file: MSBT) -> None:
     """
     Writes a MSBT file to a given file path. If the target path does not exist, it will be created.
 
+    The file is written to a temporary file in the same directory first, which then replaces the target.
+    The target is therefore never left partially written, even if an error occurs while writing.
+
     :param file_path: the path to write the file to.
     :param file: the MSBT file object.
 
@@ -133,9 +287,23 @@ def write_msbt_path(file_path: str, file: MSBT) -> None:
     =====
     >>> write_msbt_path("path/to/file.msbt", msbt)
     """
-    with open(file_path, "wb") as stream:
-        data = write_msbt(file)
-        stream.write(data)
+    # Data that is still read from a memory map of the target is copied first, as a mapped file can't be replaced on every platform
+    if file.is_mapped(file_path):
+        file.close()
+
+    temp_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(temp_path, "xb") as stream:
+            write_msbt_to_stream(file, stream)
+
+        # The replaced file keeps its permissions
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
 
 
 def write_msbt(file: MSBT) -> bytes:
@@ -148,52 +316,156 @@ def write_msbt(file: MSBT) -> bytes:
     =====
     >>> data = write_msbt(msbt)
     """
-    if not isinstance(file, MSBT):
-        raise LMS_Exceptions.LMS_Error(
-            f"File provided is not valid. Expected MSBT got {type(file)}."
-        )
+    _verify_msbt(file)
 
     writer = FileWriter(file.info.encoding)
     write_file_info(writer, MSBT.MAGIC, file.info)
 
     for section in file.section_list:
-        match section:
-            case "LBL1":
-                labels = [entry.name for entry in file]
-                write_section(writer, "LBL1", write_labels, labels, file.slot_count)
-            case "NLI1":
-                labels = [entry.name for entry in file]
-                write_section(writer, "NLI1", write_nli1, labels)
-            case "ATR1":
-                attributes = [entry.attribute for entry in file]
-                if file.uses_encoded_attributes:
-                    write_section(
-                        writer,
-                        "ATR1",
-                        write_encoded_atr1,
-                        attributes,
-                        file.size_per_attribute,
-                        file.attr_string_table,
-                    )
-                else:
-                    write_section(
-                        writer,
-                        "ATR1",
-                        write_decoded_atr1,
-                        attributes,
-                        file.size_per_attribute,
-                    )
-            case "TXT2":
-                messages = [entry.message for entry in file]
-                write_section(writer, "TXT2", write_txt2, messages)
-            case "TSY1":
-                style_indexes = [entry.style_index for entry in file]
-                write_section(writer, "TSY1", write_tsy1, style_indexes)
-            case _:
-                write_unsupported_section(
-                    writer, section, file.get_unsupported_section_data(section)
-                )
+        _write_msbt_section(writer, file, section)
 
-    writer.seek(0x12)
-    writer.write_uint32(writer.get_stream_size())
+    writer.patch_uint32(FILE_SIZE_OFFSET, writer.get_stream_size())
     return writer.get_data()
+
+
+def write_msbt_to_stream(file: MSBT, stream: BinaryIO) -> int:
+    """
+    Writes a MSBT file directly to a binary stream one section at a time, and returns the amount of bytes written.
+
+    Only a single section is held in memory at once. For seekable streams, the file size in the header
+    is filled in after all sections are written. Otherwise, the size is calculated before writing, which
+    requires modified sections to be serialized twice.
+
+    :param file: a MSBT object.
+    :param stream: a binary stream opened for writing, such as a file or socket.
+
+    =====
+    Usage
+    =====
+    >>> with open("path/to/file.msbt", "wb") as stream:
+    ...     write_msbt_to_stream(msbt, stream)
+    """
+    _verify_msbt(file)
+
+    header = FileWriter(file.info.encoding)
+    write_file_info(header, MSBT.MAGIC, file.info)
+
+    seekable = stream.seekable()
+    if seekable:
+        start = stream.tell()
+    else:
+        file_size = header.get_stream_size()
+        for section in file.section_list:
+            file_size += sum(len(part) for part in _get_msbt_section_parts(file, section))
+        header.patch_uint32(FILE_SIZE_OFFSET, file_size)
+
+    stream.write(header.get_buffer())
+    file_size = header.get_stream_size()
+
+    for section in file.section_list:
+        for part in _get_msbt_section_parts(file, section):
+            stream.write(part)
+            file_size += len(part)
+
+    if seekable:
+        end = stream.tell()
+        header.patch_uint32(FILE_SIZE_OFFSET, file_size)
+        stream.seek(start)
+        stream.write(header.get_buffer())
+        stream.seek(end)
+
+    return file_size
+
+
+def _verify_msbt(file: MSBT) -> None:
+    if not isinstance(file, MSBT):
+        raise lms_exceptions.LMS_Error(
+            f"File provided is not valid. Expected MSBT got {type(file)}."
+        )
+
+    # Unloaded sections are written back as is, which is only valid for the entries they were read with
+    if file.unloaded_sections and file.has_modified_entries():
+        raise lms_exceptions.LMS_Error(
+            f"Entries can't be added, removed or renamed when the sections {file.unloaded_sections} were not loaded!"
+        )
+
+    # Values set for an unloaded section would be lost, as the original section data is written instead
+    for section in file.unloaded_sections:
+        for entry in file:
+            if _get_section_value(entry, section) is not None:
+                raise lms_exceptions.LMS_Error(
+                    f"Entry '{entry.name}' has a value for the section {section}, which was not loaded!"
+                )
+
+    if file.unloaded_sections and file.has_modified_format():
+        raise lms_exceptions.LMS_Error(
+            f"The byte order or encoding can't be changed when the sections {file.unloaded_sections} were not loaded!"
+        )
+
+
+def _get_section_value(entry: MSBTEntry, section: str) -> Any:
+    match section:
+        case "ATR1":
+            return entry.attribute
+        case "TXT2":
+            return entry.message
+        case "TSY1":
+            return entry.style_index
+
+    return None
+
+
+def _get_msbt_section_parts(file: MSBT, section: str) -> list[bytes | memoryview]:
+    writer = FileWriter(file.info.encoding)
+    writer.is_big_endian = file.info.is_big_endian
+
+    # Unmodified sections are written from their original data instead of being copied into the writer
+    data = file.get_unmodified_section_data(section)
+    if data is not None:
+        write_section_header(writer, section, len(data))
+        return [writer.get_buffer(), data, get_section_padding(len(data))]
+
+    # Sections always start on a 16 byte boundary, so the section is aligned the same as in a full file
+    _write_msbt_section(writer, file, section)
+    return [writer.get_buffer()]
+
+
+def _write_msbt_section(writer: FileWriter, file: MSBT, section: str) -> None:
+    # Sections that were not modified since they were read are copied as is
+    data = file.get_unmodified_section_data(section)
+    if data is not None:
+        write_raw_section(writer, section, data)
+        return
+
+    match section:
+        case "LBL1":
+            labels = [entry.name for entry in file]
+            write_section(writer, "LBL1", write_labels, labels, file.slot_count)
+        case "NLI1":
+            labels = [entry.name for entry in file]
+            write_section(writer, "NLI1", write_nli1, labels)
+        case "ATR1":
+            attributes = [entry.attribute for entry in file]
+            if file.uses_encoded_attributes:
+                write_section(
+                    writer,
+                    "ATR1",
+                    write_encoded_atr1,
+                    attributes,
+                    file.size_per_attribute,
+                    file.attr_string_table,
+                )
+            else:
+                write_section(
+                    writer,
+                    "ATR1",
+                    write_decoded_atr1,
+                    attributes,
+                    file.size_per_attribute,
+                )
+        case "TXT2":
+            messages = [entry.message for entry in file]
+            write_section(writer, "TXT2", write_txt2, messages)
+        case "TSY1":
+            style_indexes = [entry.style_index for entry in file]
+            write_section(writer, "TSY1", write_tsy1, style_indexes)
@@ -1,25 +1,32 @@
 from dataclasses import dataclass
 
 from lms.fileio.io import FileReader, FileWriter
-from lms.message.definitions.field.io import read_field, write_field
+from lms.message.definitions.field.io import write_field
 from lms.message.definitions.field.lms_field import (LMS_DataType, LMS_Field,
-                                                     LMS_FieldMap)
+                                                     LMS_FieldMap,
+                                                     LMS_LazyFieldMap)
 from lms.titleconfig.definitions.attribute import AttributeConfig
 
 
 @dataclass(frozen=True)
 class ATR1Data:
-    attributes: list[bytes] | list[LMS_FieldMap]
+    attributes: list[bytes | memoryview] | list[LMS_FieldMap]
     size_per_attribute: int
-    string_table: bytes | None
+    string_table: bytes | memoryview | None
 
 
 def read_atr1(
-        reader: FileReader, config: AttributeConfig | None, section_size: int
+        reader: FileReader,
+        config: AttributeConfig | None,
+        section_size: int,
+        lazy: bool = False,
+        trusted: bool = False,
 ) -> ATR1Data:
     if config is None:
         return read_encoded_atr1(reader, section_size)
-    return read_decoded_atr1(reader, config)
+    if lazy:
+        return read_lazy_atr1(reader, config, trusted)
+    return read_decoded_atr1(reader, config, trusted)
 
 
 def read_encoded_atr1(reader: FileReader, section_size: int) -> ATR1Data:
@@ -28,16 +35,16 @@ def read_encoded_atr1(reader: FileReader, section_size: int) -> ATR1Data:
     attribute_count = reader.read_uint32()
     size_per_attribute = reader.read_uint32()
 
-    attributes = [reader.read_bytes(size_per_attribute) for _ in range(attribute_count)]
+    attributes = [reader.read_slice(size_per_attribute) for _ in range(attribute_count)]
 
     string_table = None
     if section_size > 8 + size_per_attribute * attribute_count:
-        string_table = reader.read_bytes(absolute_size - reader.tell())
+        string_table = reader.read_slice(absolute_size - reader.tell())
 
     return ATR1Data(attributes, size_per_attribute, string_table)
 
 
-def read_decoded_atr1(reader: FileReader, config: AttributeConfig) -> ATR1Data:
+def read_decoded_atr1(reader: FileReader, config: AttributeConfig, trusted: bool = False) -> ATR1Data:
     # String table as a list is not necessary for decoded attributes
     # It is easier to save all changes from the user  when writing
     # to recreate the table from all the string parameters in every attribute
@@ -48,33 +55,102 @@ def read_decoded_atr1(reader: FileReader, config: AttributeConfig) -> ATR1Data:
     attr_count = reader.read_uint32()
     size_per_attribute = reader.read_uint32()
 
-    attributes, attr_start = [], reader.tell()
+    # The whole block of attributes is unpacked at once, with the string offsets resolved afterward
+    records = config.layout.read_records(reader, attr_count, size_per_attribute)
+
+    # Each offset is only decoded once, so fields that share a string share the same object
+    strings: dict[int, str] = {}
+    for record in records:
+        for i in config.layout.string_indexes:
+            offset = record[i]
+            string = strings.get(offset)
+            if string is None:
+                reader.seek(section_start + offset)
+                string = strings[offset] = reader.read_encoded_string()
+            record[i] = string
+
+    definitions = config.definitions
+    create_field = LMS_Field.from_trusted if trusted else LMS_Field
+    attributes = [
+        LMS_FieldMap({definition.name: create_field(value, definition) for definition, value in zip(definitions, record)})
+        for record in records
+    ]
 
-    for i in range(attr_count):
-        reader.seek(attr_start + i * size_per_attribute)
+    return ATR1Data(attributes, size_per_attribute, string_table)
 
-        attribute = {}
-        for definition in config.definitions:
-            if definition.datatype is LMS_DataType.STRING:
-                last = reader.tell() + 4
-                reader.seek(section_start + reader.read_uint32())
-                value = LMS_Field(reader.read_encoded_string(), definition)
-                reader.seek(last)
-            else:
-                value = read_field(reader, definition)
 
-            attribute[definition.name] = value
+def read_single_attribute(
+        reader: FileReader, config: AttributeConfig | None, index: int, trusted: bool = False
+) -> bytes | memoryview | LMS_FieldMap:
+    section_start = reader.tell()
 
-        attributes.append(LMS_FieldMap(attribute))
+    attr_count = reader.read_uint32()
+    size_per_attribute = reader.read_uint32()
+    if not 0 <= index < attr_count:
+        raise IndexError(f"The attribute index {index} is out of range of the {attr_count} attributes!")
 
-    return ATR1Data(attributes, size_per_attribute, string_table)
+    reader.skip(index * size_per_attribute)
+    if config is None:
+        return reader.read_slice(size_per_attribute)
+
+    layout = config.layout
+    if size_per_attribute < layout.size:
+        raise ValueError(
+            f"The attribute size of {size_per_attribute} is smaller than the config layout of {layout.size}!"
+        )
+
+    values = layout.unpack(reader.get_view(reader.tell(), size_per_attribute), reader.is_big_endian)
+    for i in layout.string_indexes:
+        reader.seek(section_start + values[i])
+        values[i] = reader.read_encoded_string()
+
+    create_field = LMS_Field.from_trusted if trusted else LMS_Field
+    return LMS_FieldMap(
+        {definition.name: create_field(value, definition) for definition, value in zip(config.definitions, values)}
+    )
+
+
+def read_lazy_atr1(reader: FileReader, config: AttributeConfig, trusted: bool = False) -> ATR1Data:
+    section_start = reader.tell()
+
+    attr_count = reader.read_uint32()
+    size_per_attribute = reader.read_uint32()
+
+    if size_per_attribute < config.layout.size:
+        raise ValueError(
+            f"The attribute size of {size_per_attribute} is smaller than the config layout of {config.layout.size}!"
+        )
+
+    # Strings are only read once a string field is accessed, and each offset only once for the section
+    strings: dict[int, str] = {}
+
+    def read_string(offset: int) -> str:
+        string = strings.get(offset)
+        if string is None:
+            reader.seek(section_start + offset)
+            string = strings[offset] = reader.read_encoded_string()
+        return string
+
+    attr_start = reader.tell()
+    attributes = [
+        LMS_LazyFieldMap(
+            reader.get_view(attr_start + i * size_per_attribute, size_per_attribute),
+            config,
+            reader.is_big_endian,
+            read_string,
+            trusted,
+        )
+        for i in range(attr_count)
+    ]
+
+    return ATR1Data(attributes, size_per_attribute, None)
 
 
 def write_encoded_atr1(
         writer: FileWriter,
-        attributes: list[bytes],
+        attributes: list[bytes | memoryview],
         size_per_attribute: int,
-        string_table: bytes | None,
+        string_table: bytes | memoryview | None,
 ) -> None:
     writer.write_uint32(len(attributes))
 
@@ -96,21 +172,46 @@ def write_decoded_atr1(
     writer.write_uint32(len(attributes))
     writer.write_uint32(size_per_attribute)
 
-    string_table = []
-    string_offset = 8 + size_per_attribute * len(attributes)
+    # Identical strings are only written once, with every field sharing the offset
+    string_offsets: dict[str, int] = {}
+    table_end = 8 + size_per_attribute * len(attributes)
+    terminator_size = len(writer.encoding.terminator)
+
+    def get_string_offset(value: str) -> int:
+        nonlocal table_end
+        offset = string_offsets.get(value)
+        if offset is None:
+            offset = string_offsets[value] = table_end
+            table_end += len(value) * writer.encoding.width + terminator_size
+        return offset
 
     for attr in attributes:
+        attr_start = writer.tell()
+
+        # Unmodified lazy attributes are copied as is, with only their string offsets replaced
+        data = None
+        if isinstance(attr, LMS_LazyFieldMap):
+            data = attr.get_encoded_data(writer.is_big_endian)
+
+        if data is not None and len(data) == size_per_attribute:
+            writer.write_bytes(data)
+
+            layout = attr.config.layout
+            for i in layout.string_indexes:
+                value = str(attr[attr.config.definitions[i].name].value)
+                writer.patch_uint32(attr_start + layout.field_offsets[i], get_string_offset(value))
+            continue
+
         for field in attr:
             if field.datatype is LMS_DataType.STRING:
-                field.value = str(field.value)
-
-                string_table.append(field.value)
-                writer.write_uint32(string_offset)
-                string_offset += len(field.value) * writer.encoding.width + len(
-                    writer.encoding.terminator
-                )
+                writer.write_uint32(get_string_offset(str(field.value)))
             else:
                 write_field(writer, field)
 
-    for string in string_table:
+        # The size of an attribute may be larger than its fields
+        if (padding := size_per_attribute - (writer.tell() - attr_start)) > 0:
+            writer.write_bytes(b"\x00" * padding)
+
+    # Dicts preserve insertion order, which matches the order of the offsets
+    for string in string_offsets:
         writer.write_encoded_string(string)
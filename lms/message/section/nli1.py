@@ -4,19 +4,28 @@ from lms.fileio.io import FileReader, FileWriter
 def read_nli1(reader: FileReader) -> dict[int, str]:
     entry_count = reader.read_uint32()
 
-    labels = {}
-    for _ in range(entry_count):
-        label = str(reader.read_uint32())
-        index = reader.read_uint32()
-        labels[index] = label
+    # Each entry is a pair of the label number and the item index
+    entries = reader.read_uint32_array(entry_count * 2)
+    return {index: str(label) for label, index in zip(entries[::2], entries[1::2])}
 
-    return labels
+
+def find_nli1_index(reader: FileReader, label: str) -> int | None:
+    entry_count = reader.read_uint32()
+    entries = reader.read_uint32_array(entry_count * 2)
+
+    # The labels are compared as read_nli1 names them, so "01" or "²" never match a label number
+    for number, index in zip(entries[::2], entries[1::2]):
+        if str(number) == label:
+            return index
+
+    return None
 
 
 def write_nli1(writer: FileWriter, labels: list[str]) -> None:
-    label_count = len(labels)
-    writer.write_uint32(label_count)
+    writer.write_uint32(len(labels))
 
-    for i in range(label_count):
-        writer.write_uint32(int(labels[i]))
-        writer.write_uint32(i)
+    # Each entry is a pair of the label number and the item index
+    entries = []
+    for i, label in enumerate(labels):
+        entries += (int(label), i)
+    writer.write_uint32_array(entries)
@@ -2,12 +2,13 @@ from lms.fileio.io import FileReader, FileWriter
 
 
 def read_tsy1(reader: FileReader, message_count: int) -> list[int]:
-    style_indexes = []
-    for _ in range(message_count):
-        style_indexes.append(reader.read_uint32())
-    return style_indexes
+    return reader.read_uint32_array(message_count).tolist()
+
+
+def read_style_index(reader: FileReader, index: int) -> int:
+    reader.skip(index * 4)
+    return reader.read_uint32()
 
 
 def write_tsy1(writer: FileWriter, style_indexes: list[int]) -> None:
-    for i in style_indexes:
-        writer.write_uint32(i)
+    writer.write_uint32_array(style_indexes)
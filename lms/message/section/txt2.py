@@ -1,57 +1,193 @@
+from functools import partial
+
+from lms.fileio.encoding import FileEncoding
 from lms.fileio.io import FileReader, FileWriter
 from lms.message.definitions.lms_messagetext import LMS_MessageText
 from lms.message.tag.io.tag_io import get_tag_indicator, read_tag, write_tag
-from lms.message.tag.lms_tag import LMS_DecodedTag, LMS_EncodedTag
+from lms.message.tag.lms_tag import (LMS_ControlTag, LMS_DecodedTag,
+                                     LMS_EncodedTag)
 from lms.titleconfig.definitions.tags import TagConfig
 
 
 def read_txt2(
-        reader: FileReader, config: TagConfig | None, suppress_tag_errors: bool
+        reader: FileReader,
+        config: TagConfig | None,
+        suppress_tag_errors: bool,
+        section_size: int,
+        lazy: bool = False,
+        trusted: bool = False,
 ) -> list[LMS_MessageText]:
-    encoding = reader.encoding
+    if lazy:
+        return read_lazy_txt2(reader, config, suppress_tag_errors, section_size, trusted)
+
+    message_count = reader.read_uint32()
+    return [
+        read_message(reader, offset, config, suppress_tag_errors, trusted)
+        for offset in reader.read_offset_array(message_count)
+    ]
+
+
+def read_single_message(
+        reader: FileReader,
+        index: int,
+        config: TagConfig | None,
+        suppress_tag_errors: bool,
+        trusted: bool = False,
+) -> LMS_MessageText:
+    section_start = reader.tell()
 
-    messages = []
     message_count = reader.read_uint32()
+    if not 0 <= index < message_count:
+        raise IndexError(f"The message index {index} is out of range of the {message_count} messages!")
+
+    reader.skip(index * 4)
+    offset = section_start + reader.read_uint32()
+    return read_message(reader, offset, config, suppress_tag_errors, trusted)
+
+
+def read_message(
+        reader: FileReader,
+        offset: int,
+        config: TagConfig | None,
+        suppress_tag_errors: bool,
+        trusted: bool = False,
+) -> LMS_MessageText:
+    reader.seek(offset)
+    text_segments = read_message_segments(reader, config, suppress_tag_errors, trusted)
+
+    # The encoded data is kept so that unmodified messages can be written back as is
+    data = reader.get_view(offset, reader.tell() - offset)
+    return LMS_MessageText.from_encoded(
+        data, reader.encoding, reader.is_big_endian,
+        tag_config=config, segments=text_segments,
+    )
+
+
+def read_lazy_txt2(
+        reader: FileReader,
+        config: TagConfig | None,
+        suppress_tag_errors: bool,
+        section_size: int,
+        trusted: bool = False,
+) -> list[LMS_MessageText]:
+    section_end = reader.tell() + section_size
+
+    message_count = reader.read_uint32()
+    offsets = reader.read_offset_array(message_count)
+
+    # Each message spans from its offset to the next message, or the end of the section.
+    # Sorting the offsets also handles files where several entries share the same message
+    boundaries = sorted(set(offsets))
+    message_ends = dict(zip(boundaries, boundaries[1:] + [section_end]))
+
+    messages = []
+    for offset in offsets:
+        reader.seek(offset)
+        data = reader.read_slice(message_ends[offset] - offset)
+        decoder = partial(
+            decode_message,
+            data,
+            reader.encoding,
+            reader.is_big_endian,
+            config,
+            suppress_tag_errors,
+            offset % reader.encoding.width,
+            trusted,
+        )
+        messages.append(
+            LMS_MessageText.from_encoded(
+                data, reader.encoding, reader.is_big_endian, decoder, config
+            )
+        )
 
+    return messages
+
+
+def decode_message(
+        data: bytes | memoryview,
+        encoding: FileEncoding,
+        is_big_endian: bool,
+        config: TagConfig | None,
+        suppress_tag_errors: bool,
+        alignment: int = 0,
+        trusted: bool = False,
+) -> list[str | LMS_ControlTag]:
+    # Tag string parameters are aligned relative to the file, so the data is
+    # shifted to keep the alignment it had at its original offset
+    reader = FileReader(b"\x00" * alignment + data if alignment else data, is_big_endian)
+    reader.encoding = encoding
+    reader.seek(alignment)
+    return read_message_segments(reader, config, suppress_tag_errors, trusted)
+
+
+def read_message_segments(
+        reader: FileReader, config: TagConfig | None, suppress_tag_errors: bool, trusted: bool = False
+) -> list[str | LMS_ControlTag]:
+    encoding = reader.encoding
     encoding_format = encoding.to_string_format(reader.is_big_endian)
     tag_start, tag_close = get_tag_indicator(encoding, reader.is_big_endian)
 
-    for offset in reader.read_offset_array(message_count):
-        reader.seek(offset)
+    text_segments = []
+    start = reader.tell()
+    end = _find_terminator(reader, start)
 
-        text, text_segments = b"", []
-        while (data := reader.read_bytes(encoding.width)) != encoding.terminator:
-            is_closing_tag = data == tag_close
+    # Text runs are found by searching for the next tag indicator before the terminator
+    # Each run is decoded at once, and tags are only read at the indicator positions
+    while True:
+        open_index = reader.find_aligned(tag_start, start, end)
+        close_index = reader.find_aligned(tag_close, start, end)
 
-            if data == tag_start or is_closing_tag:
-                text_segments.append(text.decode(encoding_format))
-                tag = read_tag(reader, config, is_closing_tag, suppress_tag_errors)
-                text_segments.append(tag)
-                text = b""
-            else:
-                text += data
+        if open_index == -1 and close_index == -1:
+            break
 
-        # Add the remaining text in case there were no control tags
-        if text:
-            text_segments.append(text.decode(encoding_format))
+        if close_index == -1 or open_index != -1 and open_index < close_index:
+            index, is_closing_tag = open_index, False
+        else:
+            index, is_closing_tag = close_index, True
 
-        message = LMS_MessageText(text_segments, config)
-        messages.append(message)
+        text_segments.append(reader.read_bytes(index - start).decode(encoding_format))
+        reader.skip(encoding.width)
+        tag = read_tag(reader, config, is_closing_tag, suppress_tag_errors, trusted)
+        text_segments.append(tag)
 
-    return messages
+        start = reader.tell()
+        # The terminator may have been part of the tag parameters, or the tag may
+        # have shifted the code unit boundaries, so the search has to be redone
+        if start > end or (end - start) % encoding.width or end == reader.get_stream_size():
+            end = _find_terminator(reader, start)
+
+    # Add the remaining text in case there were no control tags
+    if end > start:
+        text_segments.append(reader.read_bytes(end - start).decode(encoding_format))
+
+    reader.seek(end)
+    reader.skip(encoding.width)
+    return text_segments
+
+
+def _find_terminator(reader: FileReader, start: int) -> int:
+    end = reader.find_aligned(reader.encoding.terminator, start)
+    if end == -1:
+        return reader.get_stream_size()
+    return end
 
 
 def write_txt2(writer: FileWriter, messages: list[LMS_MessageText]) -> None:
     start = writer.tell()
-    offset = 4 + 4 * len(messages)
     writer.write_uint32(len(messages))
 
+    # The messages are written in order and the offset table is filled in once all of them are written
+    table_offset = writer.reserve_bytes(4 * len(messages))
+    offsets = []
+
     for message in messages:
-        writer.write_uint32(offset)
-        next_offset = writer.tell()
+        offsets.append(writer.tell() - start)
 
-        writer.seek(start + offset)
-        text_start = writer.tell()
+        # Messages that were not modified are written back as their original data
+        data = message.get_encoded_data(writer.encoding, writer.is_big_endian)
+        if data is not None:
+            writer.write_bytes(data)
+            continue
 
         for part in message:
             if isinstance(part, (LMS_EncodedTag, LMS_DecodedTag)):
@@ -61,7 +197,4 @@ def write_txt2(writer: FileWriter, messages: list[LMS_MessageText]) -> None:
 
         writer.write_bytes(writer.encoding.terminator)
 
-        offset += writer.tell() - text_start
-        writer.seek(next_offset)
-
-    writer.seek(offset + start)
+    writer.patch_uint32_array(table_offset, offsets)
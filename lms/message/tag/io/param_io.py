@@ -20,8 +20,22 @@ def read_encoded_parameters(
 
 
 def read_decoded_parameters(
-        reader: FileReader, definition: TagDefinition
+        reader: FileReader, definition: TagDefinition, trusted: bool = False
 ) -> LMS_FieldMap | None:
+    start = reader.tell()
+    create_field = LMS_Field.from_trusted if trusted else LMS_Field
+    try:
+        values = definition.codec.read_values(reader)
+        return LMS_FieldMap(
+            {param.name: create_field(value, param) for param, value in zip(definition.parameters, values)}
+        )
+    except Exception:
+        # Read each parameter on its own, which raises a LMS_TagReadingError for the one that failed
+        reader.seek(start)
+        return _read_each_parameter(reader, definition)
+
+
+def _read_each_parameter(reader: FileReader, definition: TagDefinition) -> LMS_FieldMap:
     parameters = {}
     for param in definition.parameters:
         param_offset = reader.tell()
@@ -44,11 +58,24 @@ def read_decoded_parameters(
 
 def write_encoded_parameters(writer: FileWriter, parameters: list[int]) -> None:
     writer.write_uint16(len(parameters))
-    for param in parameters:
-        writer.write_bytes(int.to_bytes(param, 1))
+    writer.write_bytes(bytes(parameters))
 
 
 def write_decoded_parameters(
+        writer: FileWriter, parameters: LMS_FieldMap, definition: TagDefinition
+) -> None:
+    values = [field.value for field in parameters]
+    try:
+        data = definition.codec.pack_values(values, writer.encoding, writer.is_big_endian)
+    except Exception:
+        # Write each parameter on its own to report the one that failed
+        _write_each_parameter(writer, parameters, definition.group_name, definition.tag_name)
+        return
+
+    writer.write_bytes(data)
+
+
+def _write_each_parameter(
         writer: FileWriter, parameters: LMS_FieldMap, group_name: str, tag_name: str
 ) -> None:
     param_size = 0
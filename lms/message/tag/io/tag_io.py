@@ -27,6 +27,7 @@ def read_tag(
         tag_config: TagConfig | None,
         is_closing: bool,
         suppress_tag_errors: bool,
+        trusted: bool = False,
 ) -> LMS_ControlTag:
     group_id = reader.read_uint16()
     tag_index = reader.read_uint16()
@@ -47,7 +48,7 @@ def read_tag(
         return _read_decoded_tag(reader, definition, is_closing=True)
 
     try:
-        tag = _read_decoded_tag(reader, definition)
+        tag = _read_decoded_tag(reader, definition, trusted=trusted)
     except LMS_TagReadingError as e:
         if not suppress_tag_errors:
             raise e
@@ -76,7 +77,7 @@ def _read_encoded_tag(
 
 
 def _read_decoded_tag(
-        reader: FileReader, definition: TagDefinition, is_closing: bool = False
+        reader: FileReader, definition: TagDefinition, is_closing: bool = False, trusted: bool = False
 ) -> LMS_DecodedTag:
     parameter_size = reader.read_uint16()
     end = reader.tell() + parameter_size
@@ -87,7 +88,7 @@ def _read_decoded_tag(
     if is_closing:
         return LMS_DecodedTag(definition, is_closing=True)
 
-    parameters = read_decoded_parameters(reader, definition)
+    parameters = read_decoded_parameters(reader, definition, trusted)
     reader.seek(end)
     return LMS_DecodedTag(definition, parameters)
 
@@ -111,4 +112,4 @@ def write_tag(writer: FileWriter, tag: LMS_ControlTag) -> None:
     if isinstance(tag, LMS_EncodedTag):
         write_encoded_parameters(writer, tag.parameters)
     else:
-        write_decoded_parameters(writer, tag.parameters, tag.group_name, tag.tag_name)
+        write_decoded_parameters(writer, tag.parameters, tag.definition)
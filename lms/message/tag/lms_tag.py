@@ -140,6 +140,11 @@ class LMS_DecodedTag:
     def __len__(self) -> int:
         return len(self.to_text())
 
+    @property
+    def definition(self) -> TagDefinition:
+        """The config definition of the tag."""
+        return self._definition
+
     @property
     def group_id(self) -> int:
         """The group id for the tag."""
@@ -1,10 +1,11 @@
+import mmap
 import os
 from typing import BinaryIO
 
 from lms.common.lms_datatype import LMS_DataType
 from lms.common.stream.fileinfo import read_file_info
 from lms.common.stream.hashtable import read_labels
-from lms.common.stream.section import read_section_data
+from lms.common.stream.section import read_section_directory
 from lms.fileio.io import FileReader
 from lms.project.msbp import MSBP
 from lms.project.section.ali2 import read_ali2
@@ -18,12 +19,31 @@ from lms.project.section.tgp2 import read_tgp2
 
 __all__ = ["read_msbp", "read_msbp_path"]
 
+# Sections that are needed to load a section, which are loaded along with it
+SECTION_DEPENDENCIES = {
+    "CLR1": {"CLB1"},
+    "ATI2": {"ALB1", "ALI2"},
+    "SYL3": {"SLB1"},
+    "TGG2": {"TAG2", "TGP2", "TGL2"},
+}
 
-def read_msbp_path(file_path: str) -> MSBP:
+# Sections that may be selected when reading
+SECTION_NAMES = ("CLR1", "CLB1", "ATI2", "ALB1", "ALI2", "TGG2", "TAG2", "TGP2", "TGL2", "SYL3", "SLB1", "CTI1")
+
+# Label sections name the items of the section before them, so they are only loaded along with that section
+LABEL_SECTIONS = {"CLB1": "CLR1", "ALB1": "ATI2", "SLB1": "SYL3"}
+
+
+def read_msbp_path(
+        file_path: str, *, sections: set[str] | None = None, memory_map: bool = False
+) -> MSBP:
     """
     Reads and retrieves a MSBP file from a given path.
 
     :param file_path: the path to the MSBP file.
+    :param sections: the names of the sections to load. Defaults to every section.
+    :param memory_map: read the file through a read-only memory map instead of copying it into memory.
+        The MSBP does not reference the file data once it is read, so the map is closed before returning.
 
     =====
     Usage
@@ -31,19 +51,28 @@ def read_msbp_path(file_path: str) -> MSBP:
     >>> msbp = read_msbp_path("path/to/file.msbp")
     """
     with open(file_path, "rb") as stream:
-        return read_msbp(stream)
+        if not memory_map:
+            return read_msbp(stream, sections=sections)
+
+        mapping = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        project = read_msbp(mapping, sections=sections)
+        mapping.close()
+        return project
 
 
-def read_msbp(stream: BinaryIO | bytes) -> MSBP:
+def read_msbp(stream: BinaryIO | bytes | mmap.mmap, *, sections: set[str] | None = None) -> MSBP:
     """
     Reads and retrieves a MSBP file from a specified stream.
 
-    :param stream: an ``IOBase``, ``BytesIO``, ``memoryview``, or ``bytes`` object.
+    :param stream: an ``IOBase``, ``BytesIO``, ``memoryview``, ``bytes``, or ``mmap`` object.
+    :param sections: the names of the sections to load. Defaults to every section. Sections that a loaded section
+        depends on are loaded with it, such as the labels of colors, and the values of sections that aren't loaded are None.
 
     =====
     Usage
     =====
     >>> msbp = read_msbp(stream)
+    >>> msbp = read_msbp(stream, sections={"CLR1"})
     """
     reader = FileReader(stream)
     file_info = read_file_info(reader, MSBP.MAGIC)
@@ -58,8 +87,19 @@ def read_msbp(stream: BinaryIO | bytes) -> MSBP:
     styles = None
     source_list = None
 
+    if sections is not None:
+        if unknown_sections := set(sections).difference(SECTION_NAMES):
+            raise ValueError(f"Unknown sections {sorted(unknown_sections)}! Expected any of {SECTION_NAMES}.")
+
+        sections = set(sections).union(*(SECTION_DEPENDENCIES.get(section, set()) for section in sections))
+
     items = []
-    for magic, _ in read_section_data(reader, file_info.section_count):
+    for section in read_section_directory(reader, file_info.section_count):
+        magic = section.magic
+        if sections is not None and (magic not in sections or LABEL_SECTIONS.get(magic, magic) not in sections):
+            continue
+
+        reader.seek(section.offset)
         match magic:
             case "CLB1" | "ALB1" | "SLB1":
                 # Set the name attribute of last read item
@@ -4,12 +4,5 @@ from lms.project.definitions.color import LMS_Color
 
 def read_clr1(reader: FileReader) -> list[LMS_Color]:
     count = reader.read_uint32()
-    return [
-        LMS_Color(
-            reader.read_uint32(),
-            reader.read_uint32(),
-            reader.read_uint32(),
-            reader.read_uint32(),
-        )
-        for _ in range(count)
-    ]
+    values = reader.read_uint32_array(count * 4)
+    return [LMS_Color(*values[i: i + 4]) for i in range(0, len(values), 4)]
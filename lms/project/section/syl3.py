@@ -6,12 +6,9 @@ def read_styles(reader: FileReader) -> list[LMS_Style]:
     style_list = []
 
     count = reader.read_uint32()
-    for _ in range(count):
-        region_width = reader.read_uint32()
-        line_number = reader.read_uint32()
-        font_index = reader.read_uint32()
-        color_index = reader.read_uint32()
-
+    values = reader.read_uint32_array(count * 4)
+    for i in range(0, len(values), 4):
+        region_width, line_number, font_index, color_index = values[i: i + 4]
         style_list.append(LMS_Style(region_width, line_number, font_index, color_index))
 
     return style_list
@@ -10,7 +10,7 @@ def read_tag2(reader: FileReader) -> list[LMS_TagDefinition]:
         reader.seek(offset)
 
         param_count = reader.read_uint16()
-        parameter_indexes = reader.read_uint16_array(param_count)
+        parameter_indexes = reader.read_uint16_array(param_count).tolist()
         name = reader.read_encoded_string()
 
         info_list.append(LMS_TagDefinition(name, parameter_indexes))
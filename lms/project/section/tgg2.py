@@ -14,7 +14,7 @@ def read_tgg2(reader: FileReader, version: int) -> list[LMS_TagGroup]:
         group_id = reader.read_uint16() if version == 4 else i
 
         tag_count = reader.read_uint16()
-        tag_indexes = reader.read_uint16_array(tag_count)
+        tag_indexes = reader.read_uint16_array(tag_count).tolist()
 
         name = reader.read_encoded_string()
         group_list.append(LMS_TagGroup(name, group_id, tag_indexes))
@@ -19,7 +19,7 @@ def read_tgp2(reader: FileReader) -> list[LMS_TagParamDefinition]:
 
         reader.skip(1)
         list_count = reader.read_uint16()
-        list_indexes = reader.read_uint16_array(list_count)
+        list_indexes = reader.read_uint16_array(list_count).tolist()
         name = reader.read_encoded_string()
         parameter_info.append(
             LMS_TagParamDefinition(name, LMS_DataType.LIST, list_indexes)
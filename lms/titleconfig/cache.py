@@ -0,0 +1,73 @@
+import hashlib
+import marshal
+import os
+import tempfile
+
+# Increment when the parsed form of a config changes, so that older cache files are ignored
+CACHE_VERSION = 1
+
+
+def get_cache_dir() -> str:
+    """Returns the directory of the compiled config cache, which follows ``XDG_CACHE_HOME``."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "pylibms")
+
+
+def parse_yaml(content: str) -> dict:
+    """
+    Parses the content of a config.
+
+    :param content: the yaml content.
+    """
+    # PyYAML is only imported once a config has to be parsed, as it is slow to import
+    import yaml
+
+    # The C loader is much faster, but is only available when PyYAML was built with libyaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(content, Loader=loader)
+
+
+def load_cached_yaml(content: str) -> dict:
+    """
+    Parses the content of a config, using a compiled form from the disk cache when one exists.
+
+    The compiled form is keyed by a hash of the content, so a changed config is always parsed again.
+    Any error while reading or writing the cache falls back to parsing the content.
+
+    :param content: the yaml content.
+    """
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    cache_path = os.path.join(get_cache_dir(), f"{digest}-{CACHE_VERSION}.marshal")
+
+    try:
+        with open(cache_path, "rb") as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    parsed_content = parse_yaml(content)
+    _write_cache_file(cache_path, parsed_content)
+    return parsed_content
+
+
+def _write_cache_file(cache_path: str, parsed_content: dict) -> None:
+    try:
+        data = marshal.dumps(parsed_content)
+    except ValueError:
+        # The content holds a type that can't be marshalled, so it is simply not cached
+        return
+
+    # The file is written to a temporary path first, so other processes never read a partial file
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            os.unlink(temp_path)
+            raise
+    except OSError:
+        pass
@@ -1,24 +1,36 @@
+import marshal
 from importlib import resources
 
-import yaml
-
 from lms.common.lms_datatype import LMS_DataType
 from lms.project.msbp import MSBP
+from lms.titleconfig.cache import load_cached_yaml, parse_yaml
 from lms.titleconfig.definitions.attribute import AttributeConfig
 from lms.titleconfig.definitions.tags import TagConfig, TagDefinition
 from lms.titleconfig.definitions.value import ValueDefinition
 
 
+class _PresetList:
+    """Lists the presets when first accessed, so the preset directory isn't scanned when the module is imported."""
+
+    def __init__(self):
+        self._presets: list[str] | None = None
+
+    def __get__(self, instance: object, owner: type) -> list[str]:
+        if self._presets is None:
+            self._presets = [
+                file.name.removesuffix(".yaml")
+                for file in resources.files("lms.titleconfig.presets").iterdir()
+            ]
+        return self._presets
+
+
 class TitleConfig:
     """Represents a configuration for a specific title."""
 
     TAG_KEY = "tag_definitions"
     ATTR_KEY = "attribute_definitions"
 
-    PRESET_LIST = [
-        file.name.removesuffix(".yaml")
-        for file in resources.files("lms.titleconfig.presets").iterdir()
-    ]
+    PRESET_LIST = _PresetList()
 
     def __init__(
             self,
@@ -64,13 +76,17 @@ class TitleConfig:
         return self._attribute_config_map[name]
 
     @classmethod
-    def load_preset(cls, game: str):
+    def load_preset(cls, game: str, use_cache: bool = True):
         """
         Loads an existing preset from a game.
 
         :param game: the game preset.
+        :param use_cache: reuse the parsed preset if it was already loaded by the process, and load it
+            from the disk cache in ``$XDG_CACHE_HOME/pylibms`` when it exists.
 
         The list of presets are found with `TitleConfig.preset_list`.
+
+        Every load returns a new config, so changes made to one config are never seen by another.
         """
         preset_map = {preset.lower(): preset for preset in cls.PRESET_LIST}
 
@@ -79,8 +95,23 @@ class TitleConfig:
 
         actual_name = preset_map[game.lower()]
 
+        # Only the parsed content is kept, and a new copy of it is made for each config
+        if use_cache and actual_name in _loaded_presets:
+            return cls.load_config(marshal.loads(_loaded_presets[actual_name]))
+
         with resources.open_text("lms.titleconfig.presets", f"{actual_name}.yaml") as f:
-            return cls.load_config(f.read())
+            content = f.read()
+
+        if not use_cache:
+            return cls.load_config(content)
+
+        parsed_content = load_cached_yaml(content)
+        try:
+            _loaded_presets[actual_name] = marshal.dumps(parsed_content)
+        except ValueError:
+            pass
+
+        return cls.load_config(parsed_content)
 
     @classmethod
     def load_file(cls, file_path: str):
@@ -101,7 +132,7 @@ class TitleConfig:
         """
 
         if isinstance(content, str):
-            parsed_content = yaml.safe_load(content)
+            parsed_content = parse_yaml(content)
         else:
             parsed_content = content
 
@@ -130,6 +161,55 @@ class TitleConfig:
 
         return cls(game, attribute_configs, tag_config)
 
+    @classmethod
+    def from_msbp(cls, game: str | None, project: MSBP):
+        """
+        Creates the config of a game directly from its MSBP, without generating and loading a config file.
+
+        The list items of list definitions are shared with the MSBP instead of being copied.
+
+        :param game: the name of the game to create the config for.
+        :param project: a MSBP object.
+
+        =====
+        Usage
+        =====
+        >>> config = TitleConfig.from_msbp("Game", read_msbp_path("path/to/file.msbp"))
+        >>> msbt = read_msbt_path("path/to/file.msbt", tag_config=config.tag_config)
+        """
+        tag_config = None
+        if project.tag_groups is not None:
+            group_map = {group.group_id: group.name for group in project.tag_groups}
+
+            tag_definitions: dict[int, list[TagDefinition]] = {}
+            for group in project.tag_groups:
+                tag_definitions[group.group_id] = [
+                    TagDefinition(
+                        group.name,
+                        group.group_id,
+                        tag_def.name,
+                        i,
+                        "",
+                        [
+                            ValueDefinition(param_def.name, "", param_def.datatype, param_def.list_items)
+                            for param_def in tag_def.parameter_definitions
+                        ],
+                    )
+                    for i, tag_def in enumerate(group.tag_definitions)
+                ]
+
+            tag_config = TagConfig(group_map, tag_definitions)
+
+        attribute_configs = {}
+        if project.attribute_definitions is not None:
+            definitions = [
+                ValueDefinition(attr_def.name, "", attr_def.datatype, attr_def.list_items)
+                for attr_def in project.attribute_definitions
+            ]
+            attribute_configs[project.name] = AttributeConfig(project.name, "", definitions)
+
+        return cls(game, attribute_configs, tag_config)
+
     @staticmethod
     def generate_file(file_path: str, game: str, project: MSBP) -> None:
         """
@@ -139,6 +219,8 @@ class TitleConfig:
         :param game: the name of the game to create the config for.
         :param project: a MSBP object.
         """
+        import yaml
+
         with open(file_path, "w+") as f:
             yaml.safe_dump(
                 TitleConfig.generate_config(game, project),
@@ -216,3 +298,7 @@ class TitleConfig:
             )
 
         return config
+
+
+# The marshalled parsed content of the presets loaded by the process, keyed by the name of the preset
+_loaded_presets: dict[str, bytes] = {}
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
+from functools import cached_property
 
+from lms.titleconfig.definitions.codec import AttributeLayout
 from lms.titleconfig.definitions.value import ValueDefinition
 
 
@@ -11,3 +13,8 @@ class AttributeConfig:
     description: str
     definitions: list[ValueDefinition]
 
+    @cached_property
+    def layout(self) -> AttributeLayout:
+        """The compiled field layout of the attributes. Compiled once when attributes of the config are first read."""
+        return AttributeLayout(self.definitions)
+
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from lms.common.lms_datatype import LMS_DataType
+from lms.fileio.encoding import FileEncoding
+from lms.fileio.io import FileReader
+from lms.titleconfig.definitions.value import ValueDefinition
+
+TAG_PADDING_BYTE = b"\xcd"
+
+SIZE_STRUCTS = {False: struct.Struct("<H"), True: struct.Struct(">H")}
+
+
+@dataclass(frozen=True)
+class ValueRun:
+    """A run of consecutive fixed width values that are read and written as one struct."""
+
+    structs: dict[bool, struct.Struct]
+    count: int
+    decoders: tuple[Callable[[Any], Any] | None, ...] | None
+    encoders: tuple[Callable[[Any], Any] | None, ...] | None
+
+    @property
+    def size(self) -> int:
+        return self.structs[False].size
+
+    def unpack(self, reader: FileReader) -> list:
+        values = reader.read_struct(self.structs[reader.is_big_endian])
+        return self._decode(values)
+
+    def unpack_data(self, data: bytes | memoryview, is_big_endian: bool) -> list:
+        values = self.structs[is_big_endian].unpack_from(data)
+        return self._decode(values)
+
+    def _decode(self, values: tuple) -> list:
+        if self.decoders is None:
+            return list(values)
+        return [value if decode is None else decode(value) for decode, value in zip(self.decoders, values)]
+
+    def unpack_all(self, data: bytes | memoryview, is_big_endian: bool, stride: int) -> list[list]:
+        """
+        Unpacks consecutive records of the run from a block of data.
+
+        :param data: the block of data.
+        :param is_big_endian: if the data is big endian.
+        :param stride: the size of each record. May be larger than the run, in which case the rest of each record is skipped.
+        """
+        codec = self.structs[is_big_endian]
+        if stride != codec.size:
+            codec = struct.Struct(codec.format + f"{stride - codec.size}x")
+
+        if self.decoders is None:
+            return [list(values) for values in codec.iter_unpack(data)]
+
+        decoders = self.decoders
+        return [
+            [value if decode is None else decode(value) for decode, value in zip(decoders, values)]
+            for values in codec.iter_unpack(data)
+        ]
+
+    def pack(self, values: list, is_big_endian: bool) -> bytes:
+        if self.encoders is not None:
+            values = [value if encode is None else encode(value) for encode, value in zip(self.encoders, values)]
+        return self.structs[is_big_endian].pack(*values)
+
+
+def compile_run(definitions: list[ValueDefinition], string_format: str | None = None) -> ValueRun:
+    """
+    Compiles a run of fixed width value definitions.
+
+    :param definitions: the definitions in the run.
+    :param string_format: the struct format of string fields stored as offsets. Strings may only be included if provided.
+    """
+    formats, decoders, encoders = [], [], []
+    for definition in definitions:
+        if definition.datatype is LMS_DataType.STRING:
+            if string_format is None:
+                raise ValueError("Strings are not fixed width and can only be included as offsets!")
+
+            formats.append(string_format)
+            decoders.append(None)
+            encoders.append(None)
+            continue
+
+        formats.append(definition.datatype.struct_format)
+
+        match definition.datatype:
+            case LMS_DataType.LIST:
+                item_indexes = {item: i for i, item in enumerate(definition.list_items)}
+                decoders.append(definition.list_items.__getitem__)
+                encoders.append(item_indexes.__getitem__)
+            case LMS_DataType.BOOL:
+                decoders.append(bool)
+                encoders.append(None)
+            case _:
+                decoders.append(None)
+                encoders.append(None)
+
+    structs = {
+        False: struct.Struct("<" + "".join(formats)),
+        True: struct.Struct(">" + "".join(formats)),
+    }
+
+    # Runs of plain numbers skip the conversion step entirely
+    return ValueRun(
+        structs,
+        len(formats),
+        tuple(decoders) if any(decoders) else None,
+        tuple(encoders) if any(encoders) else None,
+    )
+
+
+class TagParameterCodec:
+    """
+    A compiled layout of the parameters of a tag definition.
+
+    Consecutive fixed width parameters are read and written as one struct, so only strings are handled on their own.
+    """
+
+    def __init__(self, parameters: list[ValueDefinition]):
+        # Each step is either a run of fixed width parameters, or None for a string parameter
+        self._steps: list[ValueRun | None] = []
+        self._string_count = 0
+
+        run = []
+        for parameter in parameters:
+            if parameter.datatype is not LMS_DataType.STRING:
+                run.append(parameter)
+                continue
+
+            if run:
+                self._steps.append(compile_run(run))
+                run = []
+
+            self._steps.append(None)
+            self._string_count += 1
+
+        if run:
+            self._steps.append(compile_run(run))
+
+        self._fixed_size = sum(step.size for step in self._steps if step is not None)
+
+    def read_values(self, reader: FileReader) -> list:
+        """
+        Reads the parameter values of a tag.
+
+        :param reader: a reader positioned at the first parameter.
+        """
+        values = []
+        for step in self._steps:
+            if step is None:
+                values.append(reader.read_len_string_encoded())
+            else:
+                values += step.unpack(reader)
+        return values
+
+    def pack_values(self, values: list, encoding: FileEncoding, is_big_endian: bool) -> bytes:
+        """
+        Packs the parameter values of a tag, including the size of the parameters.
+
+        :param values: the values in the order of the parameter definitions.
+        :param encoding: the encoding of the file.
+        :param is_big_endian: if the file is big endian.
+        """
+        string_format = encoding.to_string_format(is_big_endian)
+        size_struct = SIZE_STRUCTS[is_big_endian]
+
+        parts = []
+        param_size = self._fixed_size + 2 * self._string_count
+        padding_index = None
+
+        index = 0
+        for step in self._steps:
+            if step is None:
+                string = values[index]
+                if not isinstance(string, str):
+                    raise TypeError(f"Expected a string parameter, got {type(string)}.")
+
+                if padding_index is None:
+                    padding_index = len(parts)
+
+                length = len(string) * encoding.width
+                param_size += length
+                parts.append(size_struct.pack(length))
+                parts.append(string.encode(string_format))
+                index += 1
+            else:
+                parts.append(step.pack(values[index:index + step.count], is_big_endian))
+                index += step.count
+
+        # Tags are padded by a 0xCD byte if the size is not aligned to the encoding
+        # The padding is placed before the first string parameter, or otherwise at the end of the tag
+        if param_size % encoding.width != 0:
+            param_size += 1
+            parts.insert(len(parts) if padding_index is None else padding_index, TAG_PADDING_BYTE)
+
+        return size_struct.pack(param_size) + b"".join(parts)
+
+
+class AttributeLayout:
+    """
+    A compiled layout of the fields of an attribute config.
+
+    Every field of an attribute is fixed width, with string fields stored as offsets into the ATR1 section.
+    This allows a whole block of attributes to be unpacked at once.
+    """
+
+    def __init__(self, definitions: list[ValueDefinition]):
+        self._run = compile_run(definitions, string_format="I")
+        self._string_indexes = [
+            i for i, definition in enumerate(definitions) if definition.datatype is LMS_DataType.STRING
+        ]
+        self._field_indexes = {definition.name: i for i, definition in enumerate(definitions)}
+
+        self._field_offsets = []
+        offset = 0
+        for definition in definitions:
+            self._field_offsets.append(offset)
+            offset += 4 if definition.datatype is LMS_DataType.STRING else definition.datatype.stream_size
+
+    @property
+    def size(self) -> int:
+        """The size of the fields of a single attribute."""
+        return self._run.size
+
+    @property
+    def string_indexes(self) -> list[int]:
+        """The indexes of the string fields, which are unpacked as offsets."""
+        return self._string_indexes
+
+    @property
+    def field_indexes(self) -> dict[str, int]:
+        """Dict of field names to their index in the layout."""
+        return self._field_indexes
+
+    @property
+    def field_offsets(self) -> list[int]:
+        """The offset of each field in an attribute."""
+        return self._field_offsets
+
+    def unpack(self, data: bytes | memoryview, is_big_endian: bool) -> list:
+        """
+        Unpacks the field values of a single attribute. String fields are returned as their offsets.
+
+        :param data: the data of the attribute.
+        :param is_big_endian: if the data is big endian.
+        """
+        return self._run.unpack_data(data, is_big_endian)
+
+    def read_records(self, reader: FileReader, count: int, size_per_attribute: int) -> list[list]:
+        """
+        Reads the field values of every attribute. String fields are returned as their offsets.
+
+        :param reader: a reader positioned at the first attribute.
+        :param count: the amount of attributes.
+        :param size_per_attribute: the size of each attribute in the section. May not be smaller than the layout.
+        """
+        if size_per_attribute < self.size:
+            raise ValueError(
+                f"The attribute size of {size_per_attribute} is smaller than the config layout of {self.size}!"
+            )
+
+        if not size_per_attribute:
+            return [[] for _ in range(count)]
+
+        data = reader.read_slice(count * size_per_attribute)
+        return self._run.unpack_all(data, reader.is_big_endian, size_per_attribute)
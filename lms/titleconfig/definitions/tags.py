@@ -1,18 +1,36 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import cached_property
 
 from lms.common.lms_datatype import LMS_DataType
+from lms.titleconfig.definitions.codec import TagParameterCodec
 from lms.titleconfig.definitions.value import ValueDefinition
 
 
 class TagConfig:
-    """Class that represents a tag structure definition."""
+    """
+    Class that represents a tag structure definition.
+
+    Definitions are indexed by name and by index when the config is created, so both lookups are constant time.
+    """
 
     def __init__(self, group_map: dict[int, str], definitions: dict[int, list[TagDefinition]]):
         self._group_map = group_map
         self._definitions = definitions
 
+        # The first definition is kept for duplicate names or indexes, which matches the order of the config
+        self._group_ids: dict[str, int] = {}
+        for group_id, group_name in group_map.items():
+            self._group_ids.setdefault(group_name, group_id)
+
+        self._definitions_by_names: dict[tuple[str, str], TagDefinition] = {}
+        self._definitions_by_indexes: dict[tuple[int, int], TagDefinition] = {}
+        for group_id, tag_defs in definitions.items():
+            for tag_def in tag_defs:
+                self._definitions_by_names.setdefault((group_map.get(group_id), tag_def.tag_name), tag_def)
+                self._definitions_by_indexes.setdefault((group_id, tag_def.tag_index), tag_def)
+
     @property
     def group_map(self) -> dict[int, str]:
         return self._group_map
@@ -22,32 +40,24 @@ class TagConfig:
         return self._definitions
 
     def get_definition_by_names(self, group_name: str, tag_name: str) -> TagDefinition:
-        group_id = None
-        for i, name in self.group_map.items():
-            if name == group_name:
-                group_id = i
-                break
-
-        if group_id is None:
+        if group_name not in self._group_ids:
             raise KeyError(
                 f"Group name '{group_name}' was not found! Is the group defined?"
             )
 
-        for tag_def in self._definitions[group_id]:
-            if tag_def.group_id == group_id and tag_def.tag_name == tag_name:
-                return tag_def
+        tag_def = self._definitions_by_names.get((group_name, tag_name))
+        if tag_def is None:
+            raise KeyError(
+                f"Tag name '{tag_name}' not found in group '{group_name}'. Is the tag defined?"
+            )
 
-        raise KeyError(
-            f"Tag name '{tag_name}' not found in group '{group_name}'. Is the tag defined?"
-        )
+        return tag_def
 
     def get_definition_by_indexes(
             self, group_id: int, tag_index: int
     ) -> TagDefinition | None:
-        if group_id not in self._group_map:
-            return None
-
-        return self._definitions[group_id][tag_index]
+        # Tag indexes may be sparse, so tags that aren't defined are None rather than an error
+        return self._definitions_by_indexes.get((group_id, tag_index))
 
 
 @dataclass(frozen=True)
@@ -61,6 +71,11 @@ class TagDefinition:
     description: str
     parameters: list[ValueDefinition] = field(default_factory=list)
 
+    @cached_property
+    def codec(self) -> TagParameterCodec:
+        """The compiled parameter layout of the tag. Compiled once when a tag of the definition is first read or written."""
+        return TagParameterCodec(self.parameters)
+
     @classmethod
     def from_dict(cls, data: dict, group_map: dict[int, str]):
         tag_name = data["name"]
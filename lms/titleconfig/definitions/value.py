@@ -1,4 +1,5 @@
 from dataclasses import dataclass, field
+from functools import cached_property
 
 from lms.common.lms_datatype import LMS_DataType
 
@@ -10,6 +11,13 @@ class ValueDefinition:
     datatype: LMS_DataType
     list_items: list[str] = field(default_factory=list)
 
+    @cached_property
+    def integer_range(self) -> tuple[int, int] | None:
+        """The (min, max) range of integer values for number types, or None for any other type."""
+        if self.datatype in (LMS_DataType.STRING, LMS_DataType.LIST, LMS_DataType.BOOL, LMS_DataType.BYTES):
+            return None
+        return self.datatype.integer_range
+
     @classmethod
     def from_dict(cls, data: dict):
         name, description = data["name"], data["description"]